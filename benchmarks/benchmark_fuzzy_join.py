@@ -0,0 +1,290 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+# Benchmarks the fuzzy join primitive against synthetic datasets for each of the string, numeric and datetime join
+# paths, over a grid of left table sizes, key cardinalities and typo rates.  Each case is timed end to end and per
+# phase through the primitive's profile hook, both cold and with a reused join index, and the timings and join
+# counters are written to a JSON file.  A results file from an earlier commit can be passed with --compare to report
+# the change.
+#
+#     python benchmarks/benchmark_fuzzy_join.py --sizes 1000 10000 100000 --output results.json
+#     python benchmarks/benchmark_fuzzy_join.py --output results.json --compare baseline.json
+
+import argparse
+import collections
+import itertools
+import json
+import platform
+import string
+import subprocess
+import sys
+import time
+import typing
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from d3m import container
+from d3m.metadata import base as metadata_base
+
+from fuzzyjoin.fuzzy_join import FuzzyJoinPrimitive
+from fuzzyjoin.instrumentation import JoinProfile
+
+_JOIN_TYPES = collections.OrderedDict([
+    ('string', 'http://schema.org/Text'),
+    ('numeric', 'http://schema.org/Float'),
+    ('datetime', 'http://schema.org/DateTime'),
+])
+
+_KEY_COL = 'key'
+
+
+def make_keys(join_type: str, num_keys: int, random_state: np.random.RandomState) -> np.ndarray:
+    """
+    Generates an array of distinct join keys for a join type.
+    """
+    if join_type == 'string':
+        # short words with a space now and then, so the token based scorers get some use
+        alphabet = np.array(list(string.ascii_lowercase + ' '))
+        weights = np.full(len(alphabet), 1.0)
+        weights[-1] = 3.0
+        keys: typing.Set[str] = set()
+        while len(keys) < num_keys:
+            lengths = random_state.randint(6, 15, size=num_keys - len(keys))
+            for length in lengths:
+                key = ''.join(random_state.choice(alphabet, size=length, p=weights / weights.sum())).strip()
+                if key:
+                    keys.add(key)
+        return np.array(sorted(keys), dtype=object)[random_state.permutation(num_keys)]
+
+    if join_type == 'numeric':
+        return np.round(random_state.choice(num_keys * 100, size=num_keys, replace=False) / 100.0, 2)
+
+    # seconds within a year
+    seconds = random_state.choice(365 * 24 * 60 * 60, size=num_keys, replace=False)
+    return _format_times(np.datetime64('2018-01-01T00:00:00', 's') + seconds)
+
+
+def add_typos(join_type: str,
+              keys: np.ndarray,
+              typo_rate: float,
+              random_state: np.random.RandomState) -> np.ndarray:
+    """
+    Returns a copy of the keys with a random fraction of them perturbed - strings get a single character edit,
+    numbers are moved by up to 1%, and times by up to an hour.
+    """
+    keys = keys.copy()
+    typos = np.flatnonzero(random_state.random_sample(len(keys)) < typo_rate)
+
+    if join_type == 'string':
+        edits = random_state.randint(0, 3, size=len(typos))
+        letters = random_state.choice(list(string.ascii_lowercase), size=len(typos))
+        for row, edit, letter in zip(typos, edits, letters):
+            key = keys[row]
+            position = random_state.randint(0, len(key))
+            if edit == 0:
+                keys[row] = key[:position] + letter + key[position + 1:]
+            elif edit == 1 and len(key) > 1:
+                keys[row] = key[:position] + key[position + 1:]
+            else:
+                keys[row] = key[:position] + letter + key[position:]
+    elif join_type == 'numeric':
+        keys[typos] = np.round(keys[typos] * (1 + random_state.uniform(-0.01, 0.01, size=len(typos))), 2)
+    else:
+        offsets = random_state.randint(-60 * 60, 60 * 60, size=len(typos))
+        keys[typos] = _format_times(keys[typos].astype('datetime64[s]') + offsets)
+
+    return keys
+
+
+def _format_times(times: np.ndarray) -> np.ndarray:
+    # formatted the way a csv would hold them
+    return np.char.replace(np.datetime_as_string(times, unit='s'), 'T', ' ').astype(object)
+
+
+def make_tables(join_type: str,
+                num_rows: int,
+                cardinality: float,
+                typo_rate: float,
+                seed: int = 0) -> typing.Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Generates the left and right tables for a benchmark case.  The right table holds one row per distinct key, and
+    the left table has the requested number of rows drawn from those keys, with the given fraction of them
+    perturbed so they only match fuzzily.
+    """
+    random_state = np.random.RandomState(seed)
+    num_keys = max(1, int(num_rows * cardinality))
+    right_keys = make_keys(join_type, num_keys, random_state)
+    left_keys = add_typos(join_type, right_keys[random_state.randint(0, num_keys, size=num_rows)],
+                          typo_rate, random_state)
+
+    left_df = pd.DataFrame(collections.OrderedDict([
+        ('d3mIndex', np.arange(num_rows)),
+        (_KEY_COL, left_keys),
+        ('left_value', random_state.random_sample(num_rows)),
+    ]))
+    right_df = pd.DataFrame(collections.OrderedDict([
+        ('d3mIndex', np.arange(num_keys)),
+        (_KEY_COL, right_keys),
+        ('right_value', random_state.random_sample(num_keys)),
+    ]))
+    return left_df, right_df
+
+
+def make_dataset(df: pd.DataFrame, join_type: str) -> container.Dataset:
+    """
+    Wraps a table as a single resource dataset, with the join type's semantic type on the key column.
+    """
+    dataset = container.Dataset({'0': container.DataFrame(df)}, generate_metadata=True)
+    dataset.metadata = dataset.metadata.add_semantic_type(
+        ('0', metadata_base.ALL_ELEMENTS, list(df.columns).index(_KEY_COL)), _JOIN_TYPES[join_type])
+    return dataset
+
+
+def time_produce(primitive: FuzzyJoinPrimitive,
+                 left: container.Dataset,
+                 right: container.Dataset) -> typing.Tuple[typing.Dict[str, float], typing.Dict[str, int]]:
+    """
+    Runs a single join, returning the time taken end to end and in each phase, and the join's counters.
+    """
+    profiles: typing.List[JoinProfile] = []
+    FuzzyJoinPrimitive.add_profile_hook(hook=profiles.append)
+    try:
+        start = time.perf_counter()
+        primitive.produce(left=left, right=right)
+        total = time.perf_counter() - start
+    finally:
+        FuzzyJoinPrimitive.remove_profile_hook(hook=profiles.append)
+
+    timings = dict(profiles[0].timings)
+    timings['total'] = total
+    return timings, dict(profiles[0].counters)
+
+
+def run_case(join_type: str,
+             num_rows: int,
+             cardinality: float,
+             typo_rate: float,
+             accuracy: float,
+             repeat: int,
+             hyperparams: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+    """
+    Benchmarks a single case, keeping the fastest time for each phase over the repeats.  Each repeat runs a cold
+    join on a new primitive, followed by a warm join that reuses its join index.
+    """
+    left_df, right_df = make_tables(join_type, num_rows, cardinality, typo_rate)
+    left = make_dataset(left_df, join_type)
+    right = make_dataset(right_df, join_type)
+
+    hyperparams_class = FuzzyJoinPrimitive.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+    case_hyperparams = hyperparams_class.defaults().replace(
+        dict(hyperparams, left_col=_KEY_COL, right_col=_KEY_COL, accuracy=accuracy))
+
+    runs: typing.Dict[str, typing.List[typing.Dict[str, float]]] = {'cold': [], 'warm': []}
+    counters: typing.Dict[str, typing.Dict[str, int]] = {}
+    for _ in range(repeat):
+        primitive = FuzzyJoinPrimitive(hyperparams=case_hyperparams)
+        for run in ('cold', 'warm'):
+            timings, counters[run] = time_produce(primitive, left, right)
+            runs[run].append(timings)
+
+    return {
+        'join_type': join_type,
+        'rows': num_rows,
+        'right_rows': len(right_df),
+        'cardinality': cardinality,
+        'typo_rate': typo_rate,
+        'accuracy': accuracy,
+        'counters': counters,
+        'timings': {run: {phase: min(timings[phase] for timings in run_timings) for phase in run_timings[0]}
+                    for run, run_timings in runs.items()},
+    }
+
+
+def _case_key(result: typing.Dict[str, typing.Any]) -> typing.Tuple:
+    return result['join_type'], result['rows'], result['cardinality'], result['typo_rate'], result['accuracy']
+
+
+def compare(results: typing.Dict[str, typing.Any], baseline: typing.Dict[str, typing.Any]) -> None:
+    """
+    Prints the time of each case relative to the same case in a baseline results file.
+    """
+    baseline_cases = {_case_key(result): result for result in baseline['results']}
+    print('compared against {commit}'.format(commit=baseline.get('commit')))
+    for result in results['results']:
+        baseline_result = baseline_cases.get(_case_key(result))
+        if baseline_result is None:
+            continue
+        for run, timings in result['timings'].items():
+            baseline_timings = baseline_result['timings'][run]
+            ratios = ', '.join('{phase} {ratio:.2f}x'.format(phase=phase,
+                                                             ratio=timings[phase] / baseline_timings[phase])
+                               for phase in timings if baseline_timings.get(phase, 0) > 0)
+            print('{case} {run}: {ratios}'.format(case=_case_key(result), run=run, ratios=ratios))
+
+
+def _current_commit() -> typing.Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the fuzzy join primitive on synthetic datasets.')
+    parser.add_argument('--join-types', nargs='+', choices=list(_JOIN_TYPES), default=list(_JOIN_TYPES))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 10000],
+                        help='left table row counts, up to 1000000')
+    parser.add_argument('--cardinalities', nargs='+', type=float, default=[0.1, 1.0],
+                        help='distinct keys as a fraction of the left table rows')
+    parser.add_argument('--typo-rates', nargs='+', type=float, default=[0.0, 0.1],
+                        help='fraction of left keys perturbed so they only match fuzzily')
+    parser.add_argument('--accuracy', type=float, default=0.9)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--hyperparams', type=json.loads, default={},
+                        help='additional primitive hyperparams as a JSON object')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', help='results file from an earlier run to compare against')
+    args = parser.parse_args(argv)
+
+    results: typing.Dict[str, typing.Any] = {
+        'commit': _current_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'hyperparams': args.hyperparams,
+        'results': [],
+    }
+    for join_type, num_rows, cardinality, typo_rate in itertools.product(args.join_types, args.sizes,
+                                                                         args.cardinalities, args.typo_rates):
+        result = run_case(join_type, num_rows, cardinality, typo_rate, args.accuracy, args.repeat, args.hyperparams)
+        results['results'].append(result)
+        print('{case}: cold {cold:.3f}s, warm {warm:.3f}s'.format(case=_case_key(result),
+                                                                  cold=result['timings']['cold']['total'],
+                                                                  warm=result['timings']['warm']['total']))
+        sys.stdout.flush()
+
+    with open(args.output, 'w') as output_file:
+        json.dump(results, output_file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            compare(results, json.load(baseline_file))
+
+
+if __name__ == '__main__':
+    main()
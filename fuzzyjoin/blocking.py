@@ -0,0 +1,124 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import typing
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+__all__ = ('block_pairs', 'compact_codes', 'group_rows', 'join_counts', 'join_positions', 'map_codes', 'refine_blocks')
+
+# right rows sorted by group, along with the position in the sorted rows that each group starts at and the number of
+# rows in each group
+RowGroups = typing.Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+_INT32_MAX = np.iinfo(np.int32).max
+
+
+def compact_codes(codes: np.ndarray) -> np.ndarray:
+    """
+    Returns integer codes as int32 when every code fits, taking half the memory of the int64 codes that factorizing
+    gives, and otherwise as they are.
+    """
+    if len(codes) == 0 or int(codes.max()) <= _INT32_MAX:
+        return codes.astype(np.int32, copy=False)
+    return codes
+
+
+def map_codes(codes: np.ndarray, mapping: np.ndarray) -> np.ndarray:
+    """
+    Returns the code that a mapping between codes gives each of a set of codes, with -1 mapping to -1.  The mapping
+    is applied by indexing it as compact codes, so the codes of every row are mapped at once and held as int32.
+    """
+    # -1 indexes a trailing -1
+    return compact_codes(np.append(mapping, -1))[codes]
+
+
+def block_pairs(blocks: np.ndarray, codes: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the distinct pairs of block and key code among a set of rows, as the pair of each row (-1 for rows with
+    a block or code of -1) along with the block and code of each pair, in order of first appearance.
+    """
+    valid = (blocks >= 0) & (codes >= 0)
+    num_codes = max(int(codes.max()) + 1, 1) if len(codes) > 0 else 1
+    pair_of_row = np.full(len(blocks), -1, dtype=np.int64)
+    pair_of_row[valid], pairs = pd.factorize(blocks[valid] * num_codes + codes[valid])
+    pairs = np.asarray(pairs, dtype=np.int64)
+    return pair_of_row, pairs // num_codes, pairs % num_codes
+
+
+def refine_blocks(left_blocks: np.ndarray,
+                  left_matches: np.ndarray,
+                  right_blocks: np.ndarray,
+                  right_codes: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """
+    Splits blocks of left and right rows by another join column.  Each right row moves to the block made up of its
+    current block and the code of its key, and each left row to the block made up of its current block and the code
+    of the right key it matched, so a left row stays in a block only with the right rows whose key it matched.
+    Rows that can't join anything are given a block of -1.
+    """
+    new_right_blocks, pair_blocks, pair_codes = block_pairs(right_blocks, right_codes)
+
+    # look up the right block of each left row's pair, where there is one
+    num_codes = max(int(right_codes.max()) + 1, 1) if len(right_codes) > 0 else 1
+    valid = (left_blocks >= 0) & (left_matches >= 0) & (left_matches < num_codes)
+    new_left_blocks = np.full(len(left_blocks), -1, dtype=np.int64)
+    new_left_blocks[valid] = pd.Index(pair_blocks * num_codes + pair_codes).get_indexer(
+        left_blocks[valid] * num_codes + left_matches[valid])
+    return new_left_blocks, new_right_blocks
+
+
+def group_rows(groups: np.ndarray) -> RowGroups:
+    """
+    Returns the rows with a group other than -1 sorted by group, with the start and size of each group in the
+    sorted rows, so that several sets of left rows can be joined to them without grouping them again.
+    """
+    grouped = np.flatnonzero(groups >= 0)
+    order = grouped[np.argsort(groups[grouped], kind='mergesort')]
+    counts = np.bincount(groups[grouped], minlength=int(groups.max(initial=-1)) + 1)
+    return order, np.cumsum(counts) - counts, counts
+
+
+def join_counts(left_groups: np.ndarray, row_groups: RowGroups) -> np.ndarray:
+    """
+    Returns the number of grouped rows that each left row joins.
+    """
+    return np.append(row_groups[2], 0)[_valid_groups(left_groups, row_groups)]
+
+
+def join_positions(left_groups: np.ndarray,
+                   right_groups: np.ndarray,
+                   row_groups: typing.Optional[RowGroups] = None) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the positions of the left and right rows of each joined pair of rows, where every left row joins every
+    right row in the same group, and rows with a group of -1 join nothing.  Pairs are in left row order, then
+    right row order.  The right rows can be given already grouped by group_rows.
+    """
+    right_order, group_starts, group_counts = row_groups if row_groups is not None else group_rows(right_groups)
+
+    # each left row is repeated once per right row in its group, and paired with those right rows in turn - -1
+    # indexes a trailing empty group
+    left_groups = _valid_groups(left_groups, (right_order, group_starts, group_counts))
+    left_counts = np.append(group_counts, 0)[left_groups]
+    left_positions = np.repeat(np.arange(len(left_groups)), left_counts)
+    offsets = np.arange(len(left_positions)) - np.repeat(np.cumsum(left_counts) - left_counts, left_counts)
+    right_positions = right_order[np.append(group_starts, 0)[left_groups][left_positions] + offsets]
+    return left_positions, right_positions
+
+
+def _valid_groups(left_groups: np.ndarray, row_groups: RowGroups) -> np.ndarray:
+    # left groups that no grouped row has are replaced by -1
+    return np.where(left_groups < len(row_groups[2]), left_groups, -1)
@@ -0,0 +1,88 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import time
+import typing
+
+__all__ = ('JoinBudget', 'ProgressHook')
+
+
+class JoinBudget:
+    """
+    Time and iteration allowance of a join, where an iteration is one chunk of keys matched against the right side.
+    The budget is checked before each chunk is matched, and the chunk is charged to it afterwards, when the budget
+    is handed to any progress hooks.  When the iterations run out, or the time runs out and partial results are
+    allowed, the budget is marked exhausted and the keys that are left go unmatched.  Otherwise running out of time
+    raises a TimeoutError.
+    """
+
+    def __init__(self,
+                 timeout: typing.Optional[float] = None,
+                 iterations: typing.Optional[int] = None,
+                 partial: bool = False,
+                 hooks: typing.Sequence['ProgressHook'] = ()) -> None:
+        self.timeout = timeout
+        self.iterations = iterations
+        self.partial = partial
+        self.iterations_done = 0
+        self.keys_done = 0
+        self.exhausted = False
+        self._hooks = list(hooks)
+        self._start = time.monotonic()
+
+    @property
+    def active(self) -> bool:
+        """
+        Whether the budget is limited or watched, so that keys need matching a chunk at a time.
+        """
+        return self.timeout is not None or self.iterations is not None or len(self._hooks) > 0
+
+    @property
+    def elapsed(self) -> float:
+        """
+        Seconds since the budget was created.
+        """
+        return time.monotonic() - self._start
+
+    def spend(self, keys: int) -> None:
+        """
+        Charges an iteration that matched the given number of keys, and reports progress to the hooks.
+        """
+        self.iterations_done += 1
+        self.keys_done += keys
+        for hook in self._hooks:
+            hook(self)
+
+    def check(self) -> bool:
+        """
+        Returns whether another iteration can be run.  If not, the budget is marked exhausted - or a TimeoutError is
+        raised when the time has run out and partial results aren't allowed.
+        """
+        if not self.exhausted and self.iterations is not None and self.iterations_done >= self.iterations:
+            self.exhausted = True
+        if not self.exhausted and self.timeout is not None and self.elapsed > self.timeout:
+            if not self.partial:
+                raise TimeoutError('join exceeded its timeout of ' + str(self.timeout) + ' seconds')
+            self.exhausted = True
+        return not self.exhausted
+
+    def __repr__(self) -> str:
+        return 'JoinBudget(iterations_done={iterations_done}, keys_done={keys_done}, elapsed={elapsed:.3f}, ' \
+               'exhausted={exhausted})'.format(iterations_done=self.iterations_done, keys_done=self.keys_done,
+                                               elapsed=self.elapsed, exhausted=self.exhausted)
+
+
+ProgressHook = typing.Callable[[JoinBudget], None]
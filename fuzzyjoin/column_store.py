@@ -0,0 +1,262 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import hashlib
+import os
+import typing
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from fuzzyjoin.storage import atomic_directory, load_arrays, save_arrays
+
+__all__ = ('ColumnStore', 'FrameColumnStore', 'NpyColumnStore', 'ArrowColumnStore', 'ParquetColumnStore',
+           'open_column_store', 'save_column_store')
+
+_ARROW_EXTENSIONS = ('.arrow',)
+_PARQUET_EXTENSIONS = ('.parquet', '.parq')
+
+
+class ColumnStore:
+    """
+    Named columns of equal length that are read one at a time - either a whole column, or the values at a set of
+    row positions - so a table too large to hold in memory can supply just the columns and rows a join needs.
+    """
+
+    columns: typing.List[str]
+
+    def __len__(self) -> int:
+        raise NotImplementedError()
+
+    def column(self, name: str) -> pd.Series:
+        """
+        Returns all of the values of a column, indexed from 0.
+        """
+        raise NotImplementedError()
+
+    def take(self, name: str, positions: np.ndarray) -> pd.Series:
+        """
+        Returns the values of a column at the given row positions, in that order, indexed from 0.
+        """
+        raise NotImplementedError()
+
+    def fingerprint(self) -> str:
+        """
+        Returns a digest identifying the columns and their values, which is found without reading the values when
+        they are held in a file.
+        """
+        raise NotImplementedError()
+
+
+class FrameColumnStore(ColumnStore):
+    """
+    Columns of a dataframe that is already in memory.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.columns = list(df.columns)
+        self._df = df
+
+    def __len__(self) -> int:
+        return self._df.shape[0]
+
+    def column(self, name: str) -> pd.Series:
+        return self._df[name].reset_index(drop=True)
+
+    def take(self, name: str, positions: np.ndarray) -> pd.Series:
+        taken = self._df[name].take(positions)
+        taken.index = pd.RangeIndex(len(positions))
+        return taken
+
+    def fingerprint(self) -> str:
+        digest = hashlib.sha1(repr(self.columns).encode('utf-8'))
+        for col_idx in range(self._df.shape[1]):
+            values = self._df.iloc[:, col_idx]
+            try:
+                hashed = pd.util.hash_pandas_object(values, index=False)
+            except TypeError:
+                # python objects such as lists can't be hashed, so they're compared as strings
+                hashed = pd.util.hash_pandas_object(values.astype(str), index=False)
+            digest.update(hashed.values.tobytes())
+        return digest.hexdigest()
+
+
+class NpyColumnStore(ColumnStore):
+    """
+    Columns saved as a directory of .npy files by save_column_store, which are memory mapped so that only the pages
+    holding the values read are loaded.
+    """
+
+    def __init__(self, path: str) -> None:
+        arrays, attributes = load_arrays(path)
+        self.columns = attributes['columns']
+        self._length = attributes['length']
+        self._arrays = {col_name: arrays[_array_name(col_idx)] for col_idx, col_name in enumerate(self.columns)}
+        self._digest = attributes.get('digest')
+        self._path = path
+
+    def __len__(self) -> int:
+        return self._length
+
+    def column(self, name: str) -> pd.Series:
+        return _to_series(self._arrays[name])
+
+    def take(self, name: str, positions: np.ndarray) -> pd.Series:
+        return _to_series(self._arrays[name][positions])
+
+    def fingerprint(self) -> str:
+        # stores saved without a digest are identified by their files instead
+        if self._digest is not None:
+            return self._digest
+        return _file_fingerprint(os.path.join(self._path, filename) for filename in sorted(os.listdir(self._path)))
+
+
+class _ChunkedColumnStore(ColumnStore):
+    # columns of a file split into chunks of rows that can each be read on their own, so taking rows only reads
+    # the span of each chunk that holds them
+
+    def __init__(self, path: str, columns: typing.List[str], chunk_lengths: typing.Sequence[int]) -> None:
+        self.columns = columns
+        self._path = path
+        self._offsets = np.cumsum([0] + list(chunk_lengths))
+
+    def __len__(self) -> int:
+        return int(self._offsets[-1])
+
+    def column(self, name: str) -> pd.Series:
+        return self.take(name, np.arange(len(self)))
+
+    def take(self, name: str, positions: np.ndarray) -> pd.Series:
+        positions = np.asarray(positions, dtype=np.int64)
+        chunks = np.searchsorted(self._offsets[1:], positions, side='right')
+        order = np.argsort(chunks, kind='mergesort')
+        chunk_ids, starts = np.unique(chunks[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+
+        pieces = []
+        for chunk, start, end in zip(chunk_ids, starts, ends):
+            rows = positions[order[start:end]] - self._offsets[chunk]
+            low = rows.min()
+            pieces.append(self._read_chunk(chunk, name, low, rows.max() + 1)[rows - low])
+
+        # put the values back in the order of the positions
+        taken = np.concatenate(pieces) if pieces else np.empty(0, dtype=object)
+        values = np.empty_like(taken)
+        values[order] = taken
+        return pd.Series(values)
+
+    def _read_chunk(self, chunk: int, name: str, start: int, stop: int) -> np.ndarray:
+        # values of a column over a span of rows within a chunk
+        raise NotImplementedError()
+
+    def fingerprint(self) -> str:
+        return _file_fingerprint([self._path])
+
+
+class ArrowColumnStore(_ChunkedColumnStore):
+    """
+    Columns of an Arrow IPC file, which is memory mapped and read a record batch at a time - only the spans of
+    rows that are taken are converted from Arrow's layout.
+    """
+
+    def __init__(self, path: str) -> None:
+        import pyarrow as pa  # type: ignore
+
+        self._reader = pa.RecordBatchFileReader(pa.memory_map(path, 'r'))
+        self._schema = self._reader.schema
+        super().__init__(path, list(self._schema.names),
+                         [self._reader.get_batch(i).num_rows for i in range(self._reader.num_record_batches)])
+
+    def _read_chunk(self, chunk: int, name: str, start: int, stop: int) -> np.ndarray:
+        array = self._reader.get_batch(int(chunk)).column(self._schema.get_field_index(name))
+        return np.asarray(array.slice(start, stop - start).to_pandas())
+
+
+class ParquetColumnStore(_ChunkedColumnStore):
+    """
+    Columns of a Parquet file, which is memory mapped and read a row group at a time.
+    """
+
+    def __init__(self, path: str) -> None:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.parquet as pq  # type: ignore
+
+        self._file = pq.ParquetFile(pa.memory_map(path, 'r'))
+        metadata = self._file.metadata
+        super().__init__(path, list(self._file.schema.to_arrow_schema().names),
+                         [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)])
+
+    def _read_chunk(self, chunk: int, name: str, start: int, stop: int) -> np.ndarray:
+        table = self._file.read_row_group(int(chunk), columns=[name])
+        return np.asarray(table.column(0).to_pandas())[start:stop]
+
+
+def open_column_store(path: str) -> ColumnStore:
+    """
+    Opens the columns saved at a path - a directory written by save_column_store, an Arrow IPC file (.arrow) or a
+    Parquet file (.parquet or .parq).  Arrow and Parquet files need pyarrow.
+    """
+    if os.path.isdir(path):
+        return NpyColumnStore(path)
+    extension = os.path.splitext(path)[1].lower()
+    if extension in _ARROW_EXTENSIONS:
+        return ArrowColumnStore(path)
+    if extension in _PARQUET_EXTENSIONS:
+        return ParquetColumnStore(path)
+    raise ValueError('no column store format for ' + path)
+
+
+def save_column_store(df: pd.DataFrame, path: str) -> None:
+    """
+    Saves the columns of a dataframe to a directory that open_column_store memory maps.  Columns of python objects
+    are saved as fixed width strings so they can be mapped, with missing values saved as empty strings.  A digest of
+    the saved values is written with them, so the store can be identified without reading it.
+    """
+    columns = [str(col_name) for col_name in df.columns]
+    digest = hashlib.sha1(repr(columns).encode('utf-8'))
+    arrays = {}
+    for col_idx, col_name in enumerate(df.columns):
+        values = df.iloc[:, col_idx]
+        if values.dtype == np.object_:
+            array = np.asarray(values.where(values.notnull(), '').astype(str), dtype=str)
+        else:
+            array = values.values
+        digest.update(array.dtype.str.encode('utf-8'))
+        digest.update(np.ascontiguousarray(array).tobytes())
+        arrays[_array_name(col_idx)] = array
+    with atomic_directory(path) as temp_path:
+        save_arrays(temp_path, arrays, {'columns': columns, 'length': df.shape[0], 'digest': digest.hexdigest()})
+
+
+def _array_name(col_idx: int) -> str:
+    # columns are saved by position, as their names needn't be valid file names
+    return 'column_' + str(col_idx)
+
+
+def _file_fingerprint(paths: typing.Iterable[str]) -> str:
+    # files are identified by their paths, sizes and modification times, which change whenever they're rewritten
+    digest = hashlib.sha1()
+    for file_path in paths:
+        stat = os.stat(file_path)
+        digest.update(repr((os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _to_series(values: np.ndarray) -> pd.Series:
+    # fixed width strings are read back as python strings, as they would be in a dataframe
+    if values.dtype.kind == 'U':
+        return pd.Series(values.astype(object))
+    return pd.Series(np.asarray(values))
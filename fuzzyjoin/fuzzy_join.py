@@ -15,6 +15,7 @@
 """
 
 import typing
+import functools
 import os
 import csv
 import collections
@@ -29,30 +30,172 @@ from d3m import container, exceptions, utils as d3m_utils
 from d3m.base import utils as d3m_base_utils
 from d3m.metadata import base as metadata_base, hyperparams
 from d3m.primitive_interfaces import base, transformer
-from fuzzywuzzy import fuzz, process
 from dateutil import parser
 
+from fuzzyjoin.blocking import block_pairs, compact_codes, group_rows, join_counts, join_positions, map_codes, \
+    refine_blocks
+from fuzzyjoin.budget import JoinBudget, ProgressHook
+from fuzzyjoin.column_store import ColumnStore, FrameColumnStore, open_column_store
+from fuzzyjoin.instrumentation import JoinProfile, ProfileHook
+from fuzzyjoin.join_index import JoinIndex, fingerprint
+from fuzzyjoin.join_state import JoinState, advance_state
+from fuzzyjoin.kdtree_index import KDTreeIndex
+from fuzzyjoin.match_cache import CacheInfo, MatchCache
+from fuzzyjoin.normalization import NORMALIZERS, normalize_keys, self_matching
+from fuzzyjoin.parallel import MatchFunction, map_chunks
+from fuzzyjoin.qgram_index import QGramIndex
+from fuzzyjoin.sorted_index import SortedIndex
+from fuzzyjoin.startup import read_git_commit
+from fuzzyjoin.tfidf_index import TfidfIndex
+
 __all__ = ('FuzzyJoinPrimitive',)
 
 Inputs = container.Dataset
 Outputs = container.Dataset
 
+# left cols output as categoricals, given as the code of each row's value into the distinct values of the col
+LeftCategories = typing.Dict[str, typing.Tuple[np.ndarray, np.ndarray]]
+
+# string keys can be fuzzy matched by fuzzywuzzy's WRatio score, or by the cosine similarity of their tf-idf
+# weighted character trigrams
+_STRING_MATCHERS = ('wratio', 'tfidf')
+
+# string match results, as the position of the matched right key (or -1), along with the number of right keys each
+# left key was scored against
+_STRING_MATCH_DTYPE = np.dtype([('position', np.int64), ('candidates', np.int64)])
+_STRING_NO_MATCH = np.array((-1, 0), dtype=_STRING_MATCH_DTYPE)
+
+# a join that runs out of time either raises a TimeoutError, or returns the rows joined by the keys matched so far
+_TIMEOUT_ACTIONS = ('raise', 'partial')
+
+# join type of several numeric or vector cols matched together as the coordinates of a point
+_POINT_JOIN_TYPE = 'point'
+
+# commit the primitive is installed from - read from the repository's files where possible, as d3m's helper starts
+# git processes, which slows down every process that imports the primitive
+_GIT_COMMIT = read_git_commit(os.path.dirname(__file__)) or d3m_utils.current_git_commit(os.path.dirname(__file__))
+
 
 class Hyperparams(hyperparams.Hyperparams):
-    left_col = hyperparams.Hyperparameter[str](
+    left_col = hyperparams.Hyperparameter[typing.Union[str, typing.Sequence[str]]](
         default="",
         semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
-        description='Name of left join column.'
+        description='Name of left join column, or a list of names for a join on several columns.'
     )
-    right_col = hyperparams.Hyperparameter[str](
+    right_col = hyperparams.Hyperparameter[typing.Union[str, typing.Sequence[str]]](
         default="",
         semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
-        description='Name of right join column.'
+        description='Name of right join column, or a list of names paired with the left join columns.'
     )
-    accuracy = hyperparams.Hyperparameter[float](
+    accuracy = hyperparams.Hyperparameter[typing.Union[float, typing.Sequence[float]]](
         default=0.0,
         semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
-        description='Requierd accuracy of join ranging from 0.0 to 1.0, where 1.0 is an exact match.'
+        description='Requierd accuracy of join ranging from 0.0 to 1.0, where 1.0 is an exact match.  Joins on ' +
+                    'several columns take either a single accuracy for every column or a list with one per column.'
+    )
+    n_jobs = hyperparams.Hyperparameter[int](
+        default=1,
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ResourcesUseParameter'],
+        description='Number of worker processes used to match join keys, where 1 matches serially and -1 uses all ' +
+                    'available cores.'
+    )
+    chunk_size = hyperparams.Hyperparameter[int](
+        default=10000,
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description='Number of unique left join keys matched by a worker process at a time.'
+    )
+    index_dir = hyperparams.Hyperparameter[str](
+        default="",
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description='Directory that right side join indices are saved to and reloaded from, so they can be ' +
+                    'reused across processes.  Indices are only kept in memory when empty.'
+    )
+    row_chunk_size = hyperparams.Hyperparameter[int](
+        default=0,
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ResourcesUseParameter'],
+        description='Number of left rows joined at a time, bounding the memory used by intermediate copies, or 0 ' +
+                    'to join every row at once.'
+    )
+    string_normalization = hyperparams.Hyperparameter[str](
+        default='default',
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description='Normalization applied to string keys before they are fuzzy matched - one of "default" ' +
+                    '(fuzzywuzzy\'s processing, which drops punctuation and non-ascii characters and lower cases), ' +
+                    '"casefold" (keeps non-ascii characters), "unicode" (folds accented characters onto their ' +
+                    'unaccented form) or "token_sort" (ignores word order).'
+    )
+    normalize_exact_matches = hyperparams.Hyperparameter[bool](
+        default=False,
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description='Whether string keys are matched exactly before fuzzy matching while ignoring case and ' +
+                    'surrounding or repeated whitespace.  An accuracy of 1.0 only joins exact matches.'
+    )
+    match_cache_size = hyperparams.Hyperparameter[int](
+        default=0,
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ResourcesUseParameter'],
+        description='Maximum number of string match results kept in a least recently used cache shared by all ' +
+                    'fuzzy joins in the process, or 0 to disable the cache.'
+    )
+    string_matcher = hyperparams.Hyperparameter[str](
+        default='wratio',
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description='How string keys are fuzzy matched - "wratio" joins the key with the best fuzzywuzzy WRatio ' +
+                    'score of at least 100 times the accuracy, and "tfidf" joins the key whose tf-idf weighted ' +
+                    'character trigrams have the highest cosine similarity of at least the accuracy, which is much ' +
+                    'faster for large numbers of keys.'
+    )
+    tfidf_block_size = hyperparams.Hyperparameter[int](
+        default=1000,
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ResourcesUseParameter'],
+        description='Number of left keys compared against every right key at a time by the "tfidf" string ' +
+                    'matcher, bounding the memory used by the similarity matrix.'
+    )
+    right_store = hyperparams.Hyperparameter[str](
+        default="",
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ResourcesUseParameter'],
+        description='Path of a memory mapped file that the right rows are read from in place of the right ' +
+                    'dataset\'s table, which then only needs to describe the columns - a directory saved by ' +
+                    'fuzzyjoin.column_store.save_column_store, an Arrow IPC file or a Parquet file.  Only the right ' +
+                    'join columns are read in full, and other columns are only read for the joined rows.'
+    )
+    timeout_action = hyperparams.Hyperparameter[str](
+        default='raise',
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description='What a join does when it runs out of the time given to produce - "raise" raises a ' +
+                    'TimeoutError, and "partial" returns the rows joined by the keys matched so far, with the ' +
+                    'result marked as unfinished.  Joins that run out of iterations always return partial results.'
+    )
+    point_join = hyperparams.Hyperparameter[bool](
+        default=False,
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description='Whether a join on several numeric columns, such as a latitude and longitude, matches them ' +
+                    'together as the coordinates of a point, joining each left row to the right rows with the ' +
+                    'nearest point rather than matching one column at a time.  Points are joined within a ' +
+                    'euclidean distance of 1.0 minus the accuracy times the smaller of the diagonals of the left ' +
+                    'and right points\' bounding boxes.  Vector columns are always joined as points.'
+    )
+    categorical_keys = hyperparams.Hyperparameter[bool](
+        default=False,
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description='Whether string left join columns are output as pandas categoricals of their distinct ' +
+                    'values, which take far less memory than columns of python strings when keys repeat across ' +
+                    'many rows.'
+    )
+    incremental = hyperparams.Hyperparameter[bool](
+        default=False,
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description='Whether the left table is only ever appended to, so that each join only joins and returns ' +
+                    'the left rows appended since the previous join, reusing the string matches of the keys it ' +
+                    'has already seen in place of the shared match cache.  Every left row is joined again when ' +
+                    'the right table or the join settings change, when rows already joined are modified, and ' +
+                    'always for datetime and point joins, whose tolerances depend on every left row.  A join cut ' +
+                    'short by its timeout or iterations leaves the state as it was, so its rows are joined again.'
+    )
+    state_dir = hyperparams.Hyperparameter[str](
+        default="",
+        semantic_types=['https://metadata.datadrivendiscovery.org/types/ControlParameter'],
+        description='Directory that the state of an incremental join is saved to and reloaded from, so it can be ' +
+                    'continued across processes.  The state is only kept in memory when empty.'
     )
 
 
@@ -71,7 +214,20 @@ class FuzzyJoinPrimitive(transformer.TransformerPrimitiveBase[Inputs,
 
     _DATETIME_JOIN_TYPES = set(('http://schema.org/DateTime',))
 
-    _SUPPORTED_TYPES = _STRING_JOIN_TYPES.union(_NUMERIC_JOIN_TYPES).union(_DATETIME_JOIN_TYPES)
+    _VECTOR_JOIN_TYPES = set(('https://metadata.datadrivendiscovery.org/types/FloatVector',))
+
+    _SUPPORTED_TYPES = _STRING_JOIN_TYPES.union(_NUMERIC_JOIN_TYPES).union(_DATETIME_JOIN_TYPES) \
+        .union(_VECTOR_JOIN_TYPES)
+
+    # string match results keyed by right join index fingerprint and left key, shared across instances
+    _match_cache = MatchCache(0)
+
+    # callbacks handed the profile of each join, shared across instances - joins are only profiled while there
+    # is at least one hook
+    _profile_hooks: typing.List[ProfileHook] = []
+
+    # callbacks handed the budget of each join after every chunk of keys it matches, shared across instances
+    _progress_hooks: typing.List[ProgressHook] = []
 
     __author__ = 'Uncharted Software',
     metadata = metadata_base.PrimitiveMetadata(
@@ -90,7 +246,7 @@ class FuzzyJoinPrimitive(transformer.TransformerPrimitiveBase[Inputs,
                 'type': metadata_base.PrimitiveInstallationType.PIP,
                 'package_uri': 'git+https://github.com/uncharted-distil/distil-fuzzy-join.git@' +
                                '{git_commit}#egg=distil-fuzzy-join'
-                               .format(git_commit=d3m_utils.current_git_commit(os.path.dirname(__file__)),),
+                               .format(git_commit=_GIT_COMMIT),
             }],
             'algorithm_types': [
                 metadata_base.PrimitiveAlgorithmType.ARRAY_CONCATENATION,
@@ -99,52 +255,214 @@ class FuzzyJoinPrimitive(transformer.TransformerPrimitiveBase[Inputs,
         }
     )
 
+    def __init__(self, *,
+                 hyperparams: Hyperparams,
+                 random_seed: int = 0) -> None:
+        super().__init__(hyperparams=hyperparams, random_seed=random_seed)
+
+        # right side of the most recent join on each right join col, or on each set of right join cols matched as
+        # points, reused while the cols are unchanged
+        self._join_indices: typing.Dict[typing.Union[str, typing.Tuple[str, ...]], JoinIndex] = {}
+
+        # state of the most recent incremental join, when it isn't saved to a directory
+        self._join_state: typing.Optional[JoinState] = None
+
     def produce(self, *,
                 left: Inputs,  # type: ignore
                 right: Inputs,  # type: ignore
                 timeout: float = None,
                 iterations: int = None) -> base.CallResult[Outputs]:
 
+        profile = JoinProfile(enabled=len(self._profile_hooks) > 0)
+
         # attempt to extract the main table
-        try:
-            left_resource_id, left_df = d3m_base_utils.get_tabular_resource(left, None)
-        except ValueError as error:
-            raise exceptions.InvalidArgumentValueError("Failure to find tabular resource in left dataset") from error
+        with profile.phase('extract'):
+            try:
+                left_resource_id, left_df = d3m_base_utils.get_tabular_resource(left, None)
+            except ValueError as error:
+                raise exceptions.InvalidArgumentValueError("Failure to find tabular resource in left dataset") \
+                    from error
 
-        try:
-            right_resource_id, right_df = d3m_base_utils.get_tabular_resource(right, None)
-        except ValueError as error:
-            raise exceptions.InvalidArgumentValueError("Failure to find tabular resource in right dataset") from error
+            try:
+                right_resource_id, right_df = d3m_base_utils.get_tabular_resource(right, None)
+            except ValueError as error:
+                raise exceptions.InvalidArgumentValueError("Failure to find tabular resource in right dataset") \
+                    from error
+
+        # join cols and accuracies are handled as lists, with a single accuracy applying to every col
+        left_cols = self._to_list(self.hyperparams['left_col'])
+        right_cols = self._to_list(self.hyperparams['right_col'])
+        if len(left_cols) == 0 or len(left_cols) != len(right_cols):
+            raise exceptions.InvalidArgumentValueError('left_col of ' + str(left_cols) + ' and right_col of ' +
+                                                       str(right_cols) + ' are not supported')
+        accuracies = self._to_list(self.hyperparams['accuracy'])
+        if len(accuracies) == 1:
+            accuracies = accuracies * len(left_cols)
+        if len(accuracies) != len(left_cols):
+            raise exceptions.InvalidArgumentValueError('accuracy of ' + str(accuracies) + ' is not supported')
+        for accuracy in accuracies:
+            if accuracy <= 0.0 or accuracy > 1.0:
+                raise exceptions.InvalidArgumentValueError('accuracy of ' + str(accuracy) + ' is out of range')
+
+        n_jobs = self.hyperparams['n_jobs']
+        if n_jobs == 0 or n_jobs < -1:
+            raise exceptions.InvalidArgumentValueError('n_jobs of ' + str(n_jobs) + ' is out of range')
+
+        chunk_size = self.hyperparams['chunk_size']
+        if chunk_size <= 0:
+            raise exceptions.InvalidArgumentValueError('chunk_size of ' + str(chunk_size) + ' is out of range')
+
+        row_chunk_size = self.hyperparams['row_chunk_size']
+        if row_chunk_size < 0:
+            raise exceptions.InvalidArgumentValueError('row_chunk_size of ' + str(row_chunk_size) + ' is out of range')
+
+        match_cache_size = self.hyperparams['match_cache_size']
+        if match_cache_size < 0:
+            raise exceptions.InvalidArgumentValueError('match_cache_size of ' + str(match_cache_size) +
+                                                       ' is out of range')
+        match_cache: typing.Optional[MatchCache] = None
+        if match_cache_size > 0:
+            match_cache = self._match_cache
+            match_cache.resize(match_cache_size)
 
-        accuracy = self.hyperparams['accuracy']
-        if accuracy <= 0.0 or accuracy > 1.0:
-            raise exceptions.InvalidArgumentValueError('accuracy of ' + str(accuracy) + ' is out of range')
+        normalize_exact_matches = self.hyperparams['normalize_exact_matches']
+        categorical_keys = self.hyperparams['categorical_keys']
 
-        left_col = self.hyperparams['left_col']
-        right_col = self.hyperparams['right_col']
+        string_normalization = self.hyperparams['string_normalization']
+        if string_normalization not in NORMALIZERS:
+            raise exceptions.InvalidArgumentValueError('string_normalization of ' + str(string_normalization) +
+                                                       ' is not supported')
+
+        string_matcher = self.hyperparams['string_matcher']
+        if string_matcher not in _STRING_MATCHERS:
+            raise exceptions.InvalidArgumentValueError('string_matcher of ' + str(string_matcher) +
+                                                       ' is not supported')
+
+        tfidf_block_size = self.hyperparams['tfidf_block_size']
+        if tfidf_block_size <= 0:
+            raise exceptions.InvalidArgumentValueError('tfidf_block_size of ' + str(tfidf_block_size) +
+                                                       ' is out of range')
+
+        timeout_action = self.hyperparams['timeout_action']
+        if timeout_action not in _TIMEOUT_ACTIONS:
+            raise exceptions.InvalidArgumentValueError('timeout_action of ' + str(timeout_action) +
+                                                       ' is not supported')
+        if iterations is not None and iterations <= 0:
+            raise exceptions.InvalidArgumentValueError('iterations of ' + str(iterations) + ' is out of range')
+
+        # keys are matched a chunk at a time while the join is limited or watched, and the keys left when the
+        # budget runs out go unmatched
+        budget = JoinBudget(timeout, iterations, timeout_action == 'partial', self._progress_hooks)
+
+        # right rows are read from the right table, or from a file when it's too large to load
+        right_columns: ColumnStore = FrameColumnStore(right_df)
+        right_store = self.hyperparams['right_store']
+        if right_store:
+            try:
+                right_columns = open_column_store(right_store)
+            except (OSError, ValueError, ImportError) as error:
+                raise exceptions.InvalidArgumentValueError('right_store of ' + str(right_store) +
+                                                           ' is not supported') from error
+            missing_cols = set(right_df.columns).difference(right_columns.columns)
+            if len(missing_cols) > 0:
+                raise exceptions.InvalidArgumentValueError('right_store of ' + str(right_store) + ' is missing ' +
+                                                           str(sorted(missing_cols)))
+            # the right table's cols are the ones joined, in its order, so they line up with its metadata
+            right_columns.columns = list(right_df.columns)
 
         # perform join based on semantic type
-        join_type = self._get_join_semantic_type(left, left_resource_id, left_col, right, right_resource_id, right_col)
+        join_types = []
+        with profile.phase('semantic_type'):
+            left_col_indices = self._get_column_indices(left_df)
+            right_col_indices = self._get_column_indices(right_df)
+        for left_col, right_col in zip(left_cols, right_cols):
+            with profile.phase('semantic_type'):
+                join_type = self._get_join_semantic_type(left, left_resource_id, left_col, left_col_indices,
+                                                         right, right_resource_id, right_col, right_col_indices)
+            if join_type not in self._SUPPORTED_TYPES:
+                raise exceptions.InvalidArgumentValueError('join not surpported on type ' + str(join_type))
+            join_types.append(join_type)
+
+        # numeric and vector cols matched as points share a single join index over the right points
+        point_join = self.hyperparams['point_join'] or len(self._VECTOR_JOIN_TYPES.intersection(join_types)) > 0
+        if point_join and not self._NUMERIC_JOIN_TYPES.union(self._VECTOR_JOIN_TYPES).issuperset(join_types):
+            raise exceptions.InvalidArgumentValueError('point join not supported on types ' + str(join_types))
+        if point_join and len(set(accuracies)) > 1:
+            raise exceptions.InvalidArgumentValueError('accuracy of ' + str(accuracies) + ' is not supported')
+
+        join_indices = []
+        with profile.phase('join_index'):
+            if point_join:
+                right_points = pd.DataFrame(self._get_points(right_columns, right_cols, join_types))
+                join_indices.append(self._get_join_index(_POINT_JOIN_TYPE, tuple(right_cols), right_points,
+                                                         accuracies[0], string_normalization, string_matcher))
+            else:
+                for join_type, right_col, accuracy in zip(join_types, right_cols, accuracies):
+                    join_indices.append(self._get_join_index(join_type, right_col, right_columns.column(right_col),
+                                                             accuracy, string_normalization, string_matcher))
+        profile.count('right_keys', sum(len(join_index.keys) for join_index in join_indices))
+
+        # an incremental join only joins the left rows appended since the previous join - which needs every row
+        # joining again when the right side changes, or when match tolerances are taken from every left row
+        join_state: typing.Optional[JoinState] = None
+        if self.hyperparams['incremental']:
+            with profile.phase('state'):
+                right_fingerprint = self._get_right_fingerprint(right_columns, right_cols, join_indices, left_cols,
+                                                                normalize_exact_matches, point_join)
+                join_state = advance_state(self._load_join_state(), right_fingerprint, left_df[left_cols],
+                                           not point_join and not self._DATETIME_JOIN_TYPES.intersection(join_types))
+            left_df = left_df.iloc[join_state.start:]
+            match_cache = join_state.match_cache
+            profile.count('skipped_rows', join_state.start)
+
+        # building the join indices can take a while, so check the time before matching any keys
+        budget.check()
+
         joined: pd.Dataframe = None
-        if join_type in self._STRING_JOIN_TYPES:
-            joined = self._join_string_col(left_df, left_col, right_df, right_col, accuracy)
+        join_type, left_col, right_col, join_index, accuracy = \
+            join_types[0], left_cols[0], right_cols[0], join_indices[0], accuracies[0]
+        if point_join:
+            joined = self._join_point_cols(left_df, left_cols, right_columns, right_cols, join_types, join_index,
+                                           accuracy, n_jobs, chunk_size, row_chunk_size, budget, profile)
+        elif len(left_cols) > 1:
+            joined = self._join_composite_cols(left_df, left_cols, right_columns, right_cols, join_types,
+                                               join_indices, accuracies, normalize_exact_matches,
+                                               string_normalization, match_cache, n_jobs, chunk_size,
+                                               row_chunk_size, budget, tfidf_block_size, categorical_keys, profile)
+        elif join_type in self._STRING_JOIN_TYPES:
+            joined = self._join_string_col(left_df, left_col, right_columns, right_col, join_index,
+                                           normalize_exact_matches, string_normalization, match_cache, n_jobs,
+                                           chunk_size, row_chunk_size, budget, tfidf_block_size, categorical_keys,
+                                           profile)
         elif join_type in self._NUMERIC_JOIN_TYPES:
-            joined = self._join_numeric_col(left_df, left_col, right_df, right_col, accuracy)
-        elif join_type in self._DATETIME_JOIN_TYPES:
-            joined = self._join_datetime_col(left_df, left_col, right_df, right_col, accuracy)
+            joined = self._join_numeric_col(left_df, left_col, right_columns, right_col, join_index, accuracy,
+                                            n_jobs, chunk_size, row_chunk_size, budget, profile)
         else:
-            raise exceptions.InvalidArgumentValueError('join not surpported on type ' + str(join_type))
+            joined = self._join_datetime_col(left_df, left_col, right_columns, right_col, join_index,
+                                             accuracy, n_jobs, chunk_size, row_chunk_size, budget, profile)
+        profile.count('rows', joined.shape[0])
+
+        # the rows of a join cut short by its budget are joined again by the next join
+        if join_state is not None and not budget.exhausted:
+            self._save_join_state(join_state)
 
         # create a new dataset to hold the joined data
-        resource_map = {}
-        for resource_id, resource in left.items():  # type: ignore
-            if resource_id == left_resource_id:
-                resource_map[resource_id] = joined
-            else:
-                resource_map[resource_id] = resource
-        result_dataset = container.Dataset(resource_map, generate_metadata=True)
+        with profile.phase('dataset'):
+            resource_map = {}
+            for resource_id, resource in left.items():  # type: ignore
+                if resource_id == left_resource_id:
+                    resource_map[resource_id] = joined
+                else:
+                    resource_map[resource_id] = resource
+            result_metadata = self._get_joined_metadata(left, left_resource_id, left_df, right, right_resource_id,
+                                                        right_df, right_cols, joined)
+            result_dataset = container.Dataset(resource_map, result_metadata)
 
-        return base.CallResult(result_dataset)
+        for hook in self._profile_hooks:
+            hook(profile)
+
+        return base.CallResult(result_dataset, has_finished=not budget.exhausted,
+                               iterations_done=budget.iterations_done if budget.active else None)
 
     def multi_produce(self, *,
                       produce_methods: typing.Sequence[str],
@@ -168,17 +486,155 @@ class FuzzyJoinPrimitive(transformer.TransformerPrimitiveBase[Inputs,
                                        left=left,
                                        right=right)
 
+    def _get_join_index(self,
+                        join_type: str,
+                        right_col: typing.Union[str, typing.Tuple[str, ...]],
+                        right_values: typing.Union[pd.Series, pd.DataFrame],
+                        accuracy: float,
+                        string_normalization: str,
+                        string_matcher: str) -> JoinIndex:
+        # reuse the previous join index if the right join col and settings are unchanged, then look for a saved
+        # copy, and only build a new index when neither is available
+        join_fingerprint = fingerprint(right_values, join_type, accuracy, string_normalization, string_matcher)
+        join_index = self._join_indices.get(right_col)
+        if join_index is None or join_index.fingerprint != join_fingerprint:
+            index_dir = self.hyperparams['index_dir']
+            index_path = os.path.join(index_dir, join_fingerprint)
+            if index_dir and os.path.isdir(index_path):
+                join_index = JoinIndex.load(index_path)
+            else:
+                join_index = self._build_join_index(join_type, right_values, accuracy, string_normalization,
+                                                    string_matcher, join_fingerprint)
+                if index_dir:
+                    join_index.save(index_path)
+            self._join_indices[right_col] = join_index
+        return join_index
+
+    def _load_join_state(self) -> typing.Optional[JoinState]:
+        # state of the previous incremental join, saved to the state dir when there is one
+        state_dir = self.hyperparams['state_dir']
+        if state_dir:
+            return JoinState.load(state_dir) if os.path.isdir(state_dir) else None
+        return self._join_state
+
+    def _save_join_state(self, join_state: JoinState) -> None:
+        self._join_state = join_state
+        state_dir = self.hyperparams['state_dir']
+        if state_dir:
+            join_state.save(state_dir)
+
+    @classmethod
+    def _get_right_fingerprint(cls,
+                               right_columns: ColumnStore,
+                               right_cols: typing.Sequence[str],
+                               join_indices: typing.Sequence[JoinIndex],
+                               *settings: typing.Any) -> str:
+        # identifies the right rows and the join settings - a right store is identified without reading its values
+        return fingerprint(pd.Series([join_index.fingerprint for join_index in join_indices]),
+                           right_columns.fingerprint(), right_cols, *settings)
+
+    @classmethod
+    def _build_join_index(cls,
+                          join_type: str,
+                          right_values: typing.Union[pd.Series, pd.DataFrame],
+                          accuracy: float,
+                          string_normalization: str,
+                          string_matcher: str,
+                          join_fingerprint: str) -> JoinIndex:
+        # string and numeric joins with an accuracy of 1.0 only match exactly, and have no need of a fuzzy index
+        key_index: typing.Optional[typing.Union[QGramIndex, SortedIndex, TfidfIndex, KDTreeIndex]] = None
+        if join_type in cls._STRING_JOIN_TYPES:
+            # the string indices hold the normalized keys, in the same order as the keys themselves - in the form
+            # WRatio scores choices in, for the wratio matcher
+            codes, keys = pd.factorize(right_values)
+            normalized = normalize_keys(keys, string_normalization, string_matcher == 'wratio')
+
+            # keys with nothing left once normalized, such as missing values read as empty strings, score 0 against
+            # everything - even an equal key - so they're dropped rather than matched exactly
+            kept = np.flatnonzero(normalized != '')
+            if len(kept) < len(keys):
+                key_positions = np.full(len(keys), -1, dtype=np.int64)
+                key_positions[kept] = np.arange(len(kept))
+                codes, keys, normalized = map_codes(codes, key_positions), keys[kept], normalized[kept]
+
+            if accuracy < 1.0 and string_matcher == 'tfidf':
+                key_index = TfidfIndex(normalized, accuracy)
+            elif accuracy < 1.0:
+                key_index = QGramIndex(normalized, accuracy*100)
+        elif join_type in cls._NUMERIC_JOIN_TYPES:
+            codes, keys = pd.factorize(pd.to_numeric(right_values))
+            if accuracy < 1.0:
+                key_index = SortedIndex(keys)
+        elif join_type == _POINT_JOIN_TYPE:
+            # points are given as a dataframe of their coordinates
+            codes, keys = cls._factorize_points(right_values.values)
+            key_index = KDTreeIndex(keys)
+        else:
+            # times are indexed as integer nanoseconds
+            codes, keys = cls._parse_datetime_col(right_values)
+            keys = keys.astype(np.int64)
+            key_index = SortedIndex(keys)
+        return JoinIndex(join_fingerprint, compact_codes(codes), keys, key_index)
+
+    def get_join_state(self) -> typing.Optional[JoinState]:
+        """
+        Returns the state of the most recent incremental join, whose start is the position of the first left row
+        it joined - 0 when it joined every row.
+        """
+        return self._join_state
+
+    @classmethod
+    def get_match_cache_info(cls) -> CacheInfo:
+        """
+        Returns the hit and miss counts and the size of the string match cache shared by fuzzy joins in this
+        process.
+        """
+        return cls._match_cache.cache_info()
+
+    @classmethod
+    def add_profile_hook(cls, *, hook: ProfileHook) -> None:
+        """
+        Registers a callback that is handed a JoinProfile of the phase timings and counters of every subsequent
+        join in the process.  Joins are only profiled while a hook is registered.
+        """
+        cls._profile_hooks.append(hook)
+
+    @classmethod
+    def remove_profile_hook(cls, *, hook: ProfileHook) -> None:
+        """
+        Unregisters a callback added with add_profile_hook.
+        """
+        cls._profile_hooks.remove(hook)
+
+    @classmethod
+    def add_progress_hook(cls, *, hook: ProgressHook) -> None:
+        """
+        Registers a callback that is handed the JoinBudget of every subsequent join in the process after each chunk
+        of keys it matches, with the iterations, keys and time spent so far.  Keys are matched a chunk at a time
+        while a hook is registered.
+        """
+        cls._progress_hooks.append(hook)
+
+    @classmethod
+    def remove_progress_hook(cls, *, hook: ProgressHook) -> None:
+        """
+        Unregisters a callback added with add_progress_hook.
+        """
+        cls._progress_hooks.remove(hook)
+
     @classmethod
     def _get_join_semantic_type(cls,
                                 left: container.Dataset,
                                 left_resource_id: str,
                                 left_col: str,
+                                left_col_indices: typing.Dict[str, int],
                                 right: container.Dataset,
                                 right_resource_id: str,
-                                right_col: str) -> typing.Optional[str]:
+                                right_col: str,
+                                right_col_indices: typing.Dict[str, int]) -> typing.Optional[str]:
         # get semantic types for left and right cols
-        left_types = cls._get_column_semantic_type(left, left_resource_id, left_col)
-        right_types = cls._get_column_semantic_type(right, right_resource_id, right_col)
+        left_types = cls._get_column_semantic_type(left, left_resource_id, left_col, left_col_indices)
+        right_types = cls._get_column_semantic_type(right, right_resource_id, right_col, right_col_indices)
 
         # extract supported types
         supported_left_types = left_types.intersection(cls._SUPPORTED_TYPES)
@@ -200,159 +656,589 @@ class FuzzyJoinPrimitive(transformer.TransformerPrimitiveBase[Inputs,
             return join_types[0]
         return None
 
+    @classmethod
+    def _to_list(cls, value: typing.Any) -> typing.List[typing.Any]:
+        # hyperparams that take either a single value or a sequence of them
+        if isinstance(value, (str, int, float)):
+            return [value]
+        return list(value)
+
     @classmethod
     def _get_column_semantic_type(cls,
                                   dataset: container.Dataset,
                                   resource_id: str,
-                                  col_name: str) -> typing.Set[str]:
-        for col_idx in range(dataset.metadata.query((resource_id, metadata_base.ALL_ELEMENTS))['dimension']['length']):
-            col_metadata = dataset.metadata.query((resource_id, metadata_base.ALL_ELEMENTS, col_idx))
-            if col_metadata.get('name', "") == col_name:
-                return set(col_metadata.get('semantic_types', ()))
-        return set()
+                                  col_name: str,
+                                  col_indices: typing.Dict[str, int]) -> typing.Set[str]:
+        col_idx = col_indices.get(col_name)
+        if col_idx is None:
+            return set()
+        col_metadata = dataset.metadata.query((resource_id, metadata_base.ALL_ELEMENTS, col_idx))
+        return set(col_metadata.get('semantic_types', ()))
+
+    @classmethod
+    def _get_column_indices(cls, df: container.DataFrame) -> typing.Dict[str, int]:
+        # index of each column name, keeping the first of any repeated names
+        col_indices: typing.Dict[str, int] = {}
+        for col_idx, col_name in enumerate(df.columns):
+            col_indices.setdefault(col_name, col_idx)
+        return col_indices
+
+    @classmethod
+    def _get_joined_metadata(cls,
+                             left: container.Dataset,
+                             left_resource_id: str,
+                             left_df: container.DataFrame,
+                             right: container.Dataset,
+                             right_resource_id: str,
+                             right_df: container.DataFrame,
+                             right_cols: typing.Sequence[str],
+                             joined: container.DataFrame) -> metadata_base.DataMetadata:
+        # carry the metadata of the left dataset over, and replace that of the joined resource with metadata taken
+        # from the left and right cols it was built from, rather than generating it all again from the data - the
+        # digest no longer matches the contents
+        metadata = left.metadata.remove((left_resource_id,), recursive=True)
+        metadata = metadata.update((), {'digest': metadata_base.NO_VALUE})
+
+        resource_metadata = dict(left.metadata.query((left_resource_id,)))
+        resource_metadata['dimension'] = dict(resource_metadata.get('dimension', {}), length=joined.shape[0])
+        metadata = metadata.update((left_resource_id,), resource_metadata)
+        columns_metadata = dict(left.metadata.query((left_resource_id, metadata_base.ALL_ELEMENTS)))
+        columns_metadata['dimension'] = dict(columns_metadata.get('dimension', {}), length=joined.shape[1])
+        metadata = metadata.update((left_resource_id, metadata_base.ALL_ELEMENTS), columns_metadata)
+
+        # the joined cols are the left cols followed by the right cols other than the d3m index and join cols,
+        # with names suffixed where they clash - cols with converted values take the structural type of the data,
+        # and categoricals keep that of their values
+        dropped_cols = set(['d3mIndex'] + list(right_cols))
+        sources = [(left, left_resource_id, col_idx) for col_idx in range(left_df.shape[1])] + \
+                  [(right, right_resource_id, col_idx) for col_idx, col_name in enumerate(right_df.columns)
+                   if col_name not in dropped_cols]
+        for col_idx, (dataset, resource_id, source_idx) in enumerate(sources):
+            col_metadata = dict(dataset.metadata.query((resource_id, metadata_base.ALL_ELEMENTS, source_idx)))
+            col_metadata['name'] = joined.columns[col_idx]
+            col_dtype = joined.dtypes.iloc[col_idx]
+            if col_dtype != np.object_ and not isinstance(col_dtype, pd.api.types.CategoricalDtype):
+                col_metadata['structural_type'] = col_dtype.type
+            metadata = metadata.update((left_resource_id, metadata_base.ALL_ELEMENTS, col_idx), col_metadata)
+        return metadata
 
     @classmethod
     def _string_fuzzy_match(cls,
-                            match: typing.Any,
-                            choices: typing.Sequence[typing.Any],
-                            min_score: float) -> typing.Optional[str]:
-        choice, score = process.extractOne(match, choices)
-        val = None
-        if score >= min_score:
-            val = choice
-        return val
+                            match: str,
+                            choices: typing.Sequence[str],
+                            min_score: float) -> int:
+        # position of the first of the best scoring choices, or -1 if none reach the min score - a choice only
+        # needs scoring in full if it could beat the best so far, and nothing beats a perfect score.  fuzzywuzzy
+        # is only imported once strings are scored.
+        from fuzzyjoin.scoring import wratio
+
+        best_position = -1
+        score_cutoff = min_score
+        for position, choice in enumerate(choices):
+            score = wratio(match, choice, score_cutoff)
+            if score >= score_cutoff:
+                best_position = position
+                score_cutoff = score + 1
+                if score >= 100:
+                    break
+        return best_position
+
+    @classmethod
+    def _string_fuzzy_match_keys(cls,
+                                 index: QGramIndex,
+                                 matches: np.ndarray) -> np.ndarray:
+        # only score the choices that the q-gram index can't rule out
+        vals = np.empty(len(matches), dtype=_STRING_MATCH_DTYPE)
+        for i, match in enumerate(matches):
+            candidates = index.candidates(match)
+            best = cls._string_fuzzy_match(match, index.choices[candidates], index.min_score)
+            vals[i] = candidates[best] if best >= 0 else -1, len(candidates)
+        return vals
+
+    @classmethod
+    def _tfidf_fuzzy_match_keys(cls,
+                                index: TfidfIndex,
+                                matches: np.ndarray,
+                                block_size: int) -> np.ndarray:
+        # candidates are the choices sharing at least one trigram with a key
+        vals = np.empty(len(matches), dtype=_STRING_MATCH_DTYPE)
+        vals['position'], vals['candidates'] = index.best_matches(matches, block_size)
+        return vals
+
+    @classmethod
+    def _match_string_keys(cls,
+                           left_keys: np.ndarray,
+                           join_index: JoinIndex,
+                           normalize_exact_matches: bool,
+                           string_normalization: str,
+                           match_cache: typing.Optional[MatchCache],
+                           n_jobs: int,
+                           chunk_size: int,
+                           budget: JoinBudget,
+                           tfidf_block_size: int,
+                           profile: JoinProfile) -> np.ndarray:
+        # matches are tracked as positions in the right keys, with -1 for no match - keys equal to a right key
+        # score 100, as the right keys that would normalize to nothing were dropped, so resolve those with a hash
+        # lookup and leave the rest to the fuzzy match, unless the join is exact only
+        exact = join_index.exact_matches(left_keys, normalize_exact_matches)
+        if isinstance(join_index.key_index, QGramIndex) and not normalize_exact_matches:
+            # WRatio joins the first choice a key scores 100 against, which is the first choice processed the same
+            # way as an equal choice - unless the key is processed differently as a query, when it's fuzzy matched
+            # like any other key
+            exact_positions = np.flatnonzero(exact >= 0)
+            matching = self_matching(left_keys[exact_positions], string_normalization)
+            exact[exact_positions[~matching]] = -1
+            exact[exact_positions[matching]] = join_index.key_index.first_equal(exact[exact_positions[matching]])
+        key_matches = exact.copy()
+        residual = np.flatnonzero(exact < 0) if join_index.key_index is not None else np.empty(0, dtype=np.int64)
+
+        # reuse cached results for keys matched by earlier joins - matches against a subset of the right keys have
+        # no fingerprint to cache them under
+        if join_index.fingerprint is None:
+            match_cache = None
+        unmatched: typing.List[int] = []
+        for i in residual:
+            cached, position = (False, -1) if match_cache is None else \
+                match_cache.lookup((join_index.fingerprint, left_keys[i]))
+            if cached:
+                key_matches[i] = position
+            else:
+                unmatched.append(i)
+
+        # normalize the remaining keys once up front, and fuzzy match each distinct normalized key
+        match_keys: MatchFunction = cls._string_fuzzy_match_keys
+        if isinstance(join_index.key_index, TfidfIndex):
+            match_keys = functools.partial(cls._tfidf_fuzzy_match_keys, block_size=tfidf_block_size)
+        unmatched_positions = np.array(unmatched, dtype=np.int64)
+        query_codes, queries = pd.factorize(normalize_keys(left_keys[unmatched_positions], string_normalization))
+        scored = map_chunks(match_keys, join_index.key_index, np.asarray(queries, dtype=object), n_jobs, chunk_size,
+                            budget, _STRING_NO_MATCH)
+        key_matches[unmatched_positions] = scored['position'][query_codes]
+
+        # keys left unmatched by an exhausted budget weren't scored, so nothing is cached
+        if match_cache is not None and not budget.exhausted:
+            for i in unmatched_positions:
+                match_cache.put((join_index.fingerprint, left_keys[i]), key_matches[i])
+
+        if profile.enabled:
+            profile.count('left_keys', len(left_keys))
+            profile.count('exact_matches', np.count_nonzero(exact >= 0))
+            profile.count('cached_keys', len(residual) - len(unmatched_positions))
+            profile.count('candidate_pairs', scored['candidates'].sum())
+            profile.count('matches', np.count_nonzero(key_matches >= 0))
+
+        return key_matches
 
     @classmethod
     def _join_string_col(cls,
                          left_df: container.DataFrame,
                          left_col: str,
-                         right_df: container.DataFrame,
+                         right_columns: ColumnStore,
                          right_col: str,
-                         accuracy: float) -> pd.DataFrame:
-        # use d3mIndex from left col if present
-        right_df = right_df.drop(columns='d3mIndex')
-
-        # pre-compute fuzzy matches
-        left_keys = left_df[left_col].unique()
-        right_keys = right_df[right_col].unique()
-        matches: typing.Dict[str, typing.Optional[str]] = {}
-        for left_key in left_keys:
-            matches[left_key] = cls._string_fuzzy_match(left_key, right_keys, accuracy*100)
+                         join_index: JoinIndex,
+                         normalize_exact_matches: bool,
+                         string_normalization: str,
+                         match_cache: typing.Optional[MatchCache],
+                         n_jobs: int,
+                         chunk_size: int,
+                         row_chunk_size: int,
+                         budget: JoinBudget,
+                         tfidf_block_size: int,
+                         categorical_keys: bool,
+                         profile: JoinProfile) -> pd.DataFrame:
+        with profile.phase('match'):
+            left_codes, left_keys = pd.factorize(left_df[left_col])
+            key_matches = cls._match_string_keys(left_keys, join_index, normalize_exact_matches, string_normalization,
+                                                 match_cache, n_jobs, chunk_size, budget, tfidf_block_size,
+                                                 profile)
 
-        # look up pre-computed fuzzy match for each element in the left column
-        left_df.index = left_df[left_col].map(lambda key: matches[key])
+        right_codes = join_index.codes
+        if join_index.key_index is None and normalize_exact_matches:
+            # right keys that normalize to the same string are all matched by the first of them
+            right_codes = map_codes(right_codes, join_index.exact_matches(join_index.keys, True))
 
-        # make the right col the right dataframe index
-        right_df = right_df.set_index(right_col)
+        # left rows join the right rows whose key they matched, with missing left values matching nothing - the
+        # left col can be output as a categorical of its keys
+        left_categories = {left_col: (left_codes, left_keys)} if categorical_keys else None
+        return cls._join_rows(left_df, left_col, map_codes(left_codes, key_matches), right_columns, [right_col],
+                              right_codes, row_chunk_size, profile, left_categories=left_categories)
 
-        # inner join on the left / right indices
-        joined = container.DataFrame(left_df.join(right_df, lsuffix='_1', rsuffix='_2', how='inner'))
+    @classmethod
+    def _numeric_fuzzy_match(cls,
+                             index: SortedIndex,
+                             matches: np.ndarray,
+                             accuracy: float) -> np.ndarray:
+        # nearest choice within a tolerance relative to the magnitude of each match
+        tolerance = np.abs(matches) * (1.0 - accuracy)
+        return index.nearest(matches, tolerance)
 
-        # sort on the d3m index if there, otherwise use the joined column
-        if 'd3mIndex' in joined:
-            joined = joined.sort_values(by=['d3mIndex'])
-        else:
-            joined = joined.sort_values(by=[left_col])
-        joined = joined.reset_index(drop=True)
+    @classmethod
+    def _match_numeric_keys(cls,
+                            left_keys: np.ndarray,
+                            join_index: JoinIndex,
+                            accuracy: float,
+                            n_jobs: int,
+                            chunk_size: int,
+                            budget: JoinBudget,
+                            profile: JoinProfile) -> np.ndarray:
+        # resolve the left keys that equal a right key with a hash lookup, and fuzzy match the rest against the
+        # sorted right keys - unless the join is exact only
+        key_matches = join_index.exact_matches(left_keys)
+        residual = np.flatnonzero(key_matches < 0)
+        if join_index.key_index is not None and len(residual) > 0:
+            match_func = functools.partial(cls._numeric_fuzzy_match, accuracy=accuracy)
+            key_matches[residual] = map_chunks(match_func, join_index.key_index, left_keys[residual], n_jobs,
+                                               chunk_size, budget)
 
-        return joined
+        if profile.enabled:
+            profile.count('left_keys', len(left_keys))
+            profile.count('exact_matches', len(left_keys) - len(residual))
+            profile.count('matches', np.count_nonzero(key_matches >= 0))
 
-    @classmethod
-    def _numeric_fuzzy_match(cls,
-                             match: float,
-                             choices: typing.Sequence[typing.Any],
-                             accuracy: float) -> typing.Optional[float]:
-        # not sure if this is faster than applying a lambda against the sequence - probably is
-        inv_accuracy = 1.0 - accuracy
-        min_distance = float("inf")
-        min_val = None
-        tolerance = float(match) * inv_accuracy
-        for i, num in enumerate(choices):
-            distance = abs(match - num)
-            if distance <= tolerance and distance <= min_distance:
-                min_diff = distance
-                min_val = num
-        return min_val
+        return key_matches
 
     @classmethod
     def _join_numeric_col(cls,
                           left_df: container.DataFrame,
                           left_col: str,
-                          right_df: container.DataFrame,
+                          right_columns: ColumnStore,
                           right_col: str,
-                          accuracy: float) -> pd.DataFrame:
-        # use d3mIndex from left col if present
-        right_df = right_df.drop(columns='d3mIndex')
-
-        # fuzzy match each of the left join col against the right join col value and save the results as the left
-        # dataframe index
-        right_df[right_col] = pd.to_numeric(right_df[right_col])
-        choices = right_df[right_col].unique()
-        left_df[left_col] = pd.to_numeric(left_df[left_col])
-        left_df.index = left_df[left_col]. \
-            map(lambda x: cls._numeric_fuzzy_match(x, choices, accuracy))
-
-        # make the right col the right dataframe index
-        right_df = right_df.set_index(right_col)
-
-        # inner join on the left / right indices
-        joined = container.DataFrame(left_df.join(right_df, lsuffix='_1', rsuffix='_2', how='inner'))
-
-        # sort on the d3m index if there, otherwise use the joined column
-        if 'd3mIndex' in joined:
-            joined = joined.sort_values(by=['d3mIndex'])
-        else:
-            joined = joined.sort_values(by=[left_col])
-        joined = joined.reset_index(drop=True)
+                          join_index: JoinIndex,
+                          accuracy: float,
+                          n_jobs: int,
+                          chunk_size: int,
+                          row_chunk_size: int,
+                          budget: JoinBudget,
+                          profile: JoinProfile) -> pd.DataFrame:
+        with profile.phase('match'):
+            # match the distinct values of the left join col
+            left_values = pd.to_numeric(left_df[left_col]).values
+            left_codes, left_keys = pd.factorize(left_values)
+            key_matches = cls._match_numeric_keys(left_keys, join_index, accuracy, n_jobs, chunk_size, budget,
+                                                  profile)
 
-        return joined
+        # missing left values match nothing
+        return cls._join_rows(left_df, left_col, map_codes(left_codes, key_matches), right_columns, [right_col],
+                              join_index.codes, row_chunk_size, profile, {left_col: left_values})
+
+    @classmethod
+    def _match_datetime_keys(cls,
+                             left_keys: np.ndarray,
+                             join_index: JoinIndex,
+                             tolerance: np.timedelta64,
+                             n_jobs: int,
+                             chunk_size: int,
+                             budget: JoinBudget,
+                             profile: JoinProfile) -> np.ndarray:
+        # match as integer nanoseconds
+        match_func = functools.partial(cls._datetime_fuzzy_match, tolerance=tolerance.astype(np.int64))
+        key_matches = map_chunks(match_func, join_index.key_index, left_keys.astype(np.int64), n_jobs, chunk_size,
+                                 budget)
+
+        if profile.enabled:
+            profile.count('left_keys', len(left_keys))
+            profile.count('matches', np.count_nonzero(key_matches >= 0))
+
+        return key_matches
 
     @classmethod
     def _join_datetime_col(cls,
                            left_df: container.DataFrame,
                            left_col: str,
-                           right_df: container.DataFrame,
+                           right_columns: ColumnStore,
                            right_col: str,
-                           accuracy: float) -> pd.DataFrame:
-        # use d3mIndex from left col if present
-        right_df = right_df.drop(columns='d3mIndex')
+                           join_index: JoinIndex,
+                           accuracy: float,
+                           n_jobs: int,
+                           chunk_size: int,
+                           row_chunk_size: int,
+                           budget: JoinBudget,
+                           profile: JoinProfile) -> pd.DataFrame:
+        with profile.phase('match'):
+            # parse the distinct values of the left join col - the right side is already parsed into the index
+            left_codes, left_keys = cls._parse_datetime_col(left_df[left_col])
+            choices = join_index.keys.astype('datetime64[ns]')
 
-        # compute a tolerance delta for time matching based on a percentage of the minimum left/right time
-        # range
-        choices = np.array([np.datetime64(parser.parse(dt)) for dt in right_df[right_col].unique()])
-        left_keys = np.array([np.datetime64(parser.parse(dt)) for dt in left_df[left_col].values])
-        time_tolerance = (1.0 - accuracy) * cls._compute_time_range(left_keys, choices)
+            # compute a tolerance delta for time matching based on a percentage of the minimum left/right time
+            # range
+            time_tolerance = (1.0 - accuracy) * cls._compute_time_range(left_keys, choices)
 
-        left_df.index = np.array([cls._datetime_fuzzy_match(dt, choices, time_tolerance) for dt in left_keys])
+            key_matches = cls._match_datetime_keys(left_keys, join_index, time_tolerance, n_jobs, chunk_size,
+                                                   budget, profile)
 
-        # make the right col the right dataframe index
-        right_df = right_df.set_index(right_col)
+        # missing left values match nothing
+        return cls._join_rows(left_df, left_col, map_codes(left_codes, key_matches), right_columns, [right_col],
+                              join_index.codes, row_chunk_size, profile)
 
-        # inner join on the left / right indices
-        joined = container.DataFrame(left_df.join(right_df, lsuffix='_1', rsuffix='_2', how='inner'))
+    @classmethod
+    def _point_fuzzy_match(cls,
+                           index: KDTreeIndex,
+                           matches: np.ndarray,
+                           tolerance: float) -> np.ndarray:
+        # nearest choice within a euclidean distance of each point
+        return index.nearest(matches, tolerance)
 
-        # sort on the d3m index if there, otherwise use the joined column
-        if 'd3mIndex' in joined:
-            joined = joined.sort_values(by=['d3mIndex'])
-        else:
-            joined = joined.sort_values(by=[left_col])
-        joined = joined.reset_index(drop=True)
+    @classmethod
+    def _join_point_cols(cls,
+                         left_df: container.DataFrame,
+                         left_cols: typing.Sequence[str],
+                         right_columns: ColumnStore,
+                         right_cols: typing.Sequence[str],
+                         join_types: typing.Sequence[str],
+                         join_index: JoinIndex,
+                         accuracy: float,
+                         n_jobs: int,
+                         chunk_size: int,
+                         row_chunk_size: int,
+                         budget: JoinBudget,
+                         profile: JoinProfile) -> pd.DataFrame:
+        with profile.phase('match'):
+            # match the distinct left points against the right points in the k-d tree
+            left_codes, left_keys = cls._factorize_points(cls._get_points(FrameColumnStore(left_df), left_cols,
+                                                                          join_types))
+            if left_keys.shape[1] != join_index.keys.shape[1]:
+                raise exceptions.InvalidArgumentValueError('points of ' + str(left_keys.shape[1]) + ' and ' +
+                                                           str(join_index.keys.shape[1]) +
+                                                           ' dimensions are not supported')
+
+            # compute a distance tolerance based on a percentage of the smaller of the left and right point extents
+            tolerance = (1.0 - accuracy) * cls._compute_point_range(left_keys, join_index.keys)
+            match_func = functools.partial(cls._point_fuzzy_match, tolerance=tolerance)
+            key_matches = map_chunks(match_func, join_index.key_index, left_keys, n_jobs, chunk_size, budget)
+
+            if profile.enabled:
+                profile.count('left_keys', len(left_keys))
+                profile.count('matches', np.count_nonzero(key_matches >= 0))
+
+        # numeric left cols are output as numbers, and missing left points match nothing
+        left_values = {col: pd.to_numeric(left_df[col]).values
+                       for col, join_type in zip(left_cols, join_types) if join_type in cls._NUMERIC_JOIN_TYPES}
+        return cls._join_rows(left_df, left_cols[0], map_codes(left_codes, key_matches), right_columns, right_cols,
+                              join_index.codes, row_chunk_size, profile, left_values)
+
+    @classmethod
+    def _join_composite_cols(cls,
+                             left_df: container.DataFrame,
+                             left_cols: typing.Sequence[str],
+                             right_columns: ColumnStore,
+                             right_cols: typing.Sequence[str],
+                             join_types: typing.Sequence[str],
+                             join_indices: typing.Sequence[JoinIndex],
+                             accuracies: typing.Sequence[float],
+                             normalize_exact_matches: bool,
+                             string_normalization: str,
+                             match_cache: typing.Optional[MatchCache],
+                             n_jobs: int,
+                             chunk_size: int,
+                             row_chunk_size: int,
+                             budget: JoinBudget,
+                             tfidf_block_size: int,
+                             categorical_keys: bool,
+                             profile: JoinProfile) -> pd.DataFrame:
+        # rows are split into blocks one join col at a time, and a left row only ever joins the right rows in its
+        # block - exact cols go first, as they split the rows with a hash lookup, and each fuzzy col then matches
+        # the best right key among the few left in a block, in the order the cols were given
+        left_blocks = np.zeros(left_df.shape[0], dtype=np.int64)
+        right_blocks = np.zeros(len(right_columns), dtype=np.int64)
+        left_values: typing.Dict[str, np.ndarray] = {}
+        left_categories: LeftCategories = {}
+        order = sorted(range(len(left_cols)), key=lambda i: join_indices[i].key_index is not None)
+        with profile.phase('match'):
+            for i in order:
+                join_type, join_index, accuracy = join_types[i], join_indices[i], accuracies[i]
+                right_codes = join_index.codes
+                if join_type in cls._STRING_JOIN_TYPES:
+                    left_codes, left_keys = pd.factorize(left_df[left_cols[i]])
+                    if categorical_keys:
+                        left_categories[left_cols[i]] = left_codes, left_keys
+                    match_keys = functools.partial(cls._match_string_keys,
+                                                   normalize_exact_matches=normalize_exact_matches,
+                                                   string_normalization=string_normalization,
+                                                   match_cache=match_cache, n_jobs=n_jobs, chunk_size=chunk_size,
+                                                   budget=budget, tfidf_block_size=tfidf_block_size,
+                                                   profile=profile)
+                    if join_index.key_index is None and normalize_exact_matches:
+                        # right keys that normalize to the same string are all matched by the first of them
+                        right_codes = map_codes(right_codes, join_index.exact_matches(join_index.keys, True))
+                elif join_type in cls._NUMERIC_JOIN_TYPES:
+                    left_values[left_cols[i]] = pd.to_numeric(left_df[left_cols[i]]).values
+                    left_codes, left_keys = pd.factorize(left_values[left_cols[i]])
+                    match_keys = functools.partial(cls._match_numeric_keys, accuracy=accuracy, n_jobs=n_jobs,
+                                                   chunk_size=chunk_size, budget=budget, profile=profile)
+                else:
+                    # the tolerance is taken from the whole of both cols, so it doesn't depend on the blocks
+                    left_codes, left_keys = cls._parse_datetime_col(left_df[left_cols[i]])
+                    time_tolerance = (1.0 - accuracy) * cls._compute_time_range(
+                        left_keys, join_index.keys.astype('datetime64[ns]'))
+                    match_keys = functools.partial(cls._match_datetime_keys, tolerance=time_tolerance,
+                                                   n_jobs=n_jobs, chunk_size=chunk_size, budget=budget,
+                                                   profile=profile)
+
+                # exact matches don't depend on the block, so all of the left keys are looked up at once
+                if join_index.key_index is None:
+                    left_matches = map_codes(left_codes, match_keys(left_keys, join_index))
+                else:
+                    left_matches = cls._match_in_blocks(match_keys, join_index, left_blocks, left_codes, left_keys,
+                                                        right_blocks, right_codes)
+                left_blocks, right_blocks = refine_blocks(left_blocks, left_matches, right_blocks, right_codes)
+
+        # left rows join the right rows left in the same block
+        return cls._join_rows(left_df, left_cols[0], left_blocks, right_columns, right_cols, right_blocks,
+                              row_chunk_size, profile, left_values, left_categories)
+
+    @classmethod
+    def _match_in_blocks(cls,
+                         match_keys: typing.Callable[[np.ndarray, JoinIndex], np.ndarray],
+                         join_index: JoinIndex,
+                         left_blocks: np.ndarray,
+                         left_codes: np.ndarray,
+                         left_keys: np.ndarray,
+                         right_blocks: np.ndarray,
+                         right_codes: np.ndarray) -> np.ndarray:
+        # position in the right keys of the key matched by each left row, matching each distinct left key in a
+        # block against only the distinct right keys in the same block, with -1 for no match
+        left_pairs, pair_blocks, pair_keys = block_pairs(left_blocks, left_codes)
+        _, right_pair_blocks, right_pair_keys = block_pairs(right_blocks, right_codes)
+
+        # group the left and right pairs by block
+        right_order = np.argsort(right_pair_blocks, kind='mergesort')
+        right_pair_blocks = right_pair_blocks[right_order]
+        right_pair_keys = right_pair_keys[right_order]
+        left_order = np.argsort(pair_blocks, kind='mergesort')
+        blocks, starts = np.unique(pair_blocks[left_order], return_index=True)
+        ends = np.append(starts[1:], len(left_order))
+        lows = np.searchsorted(right_pair_blocks, blocks, side='left')
+        highs = np.searchsorted(right_pair_blocks, blocks, side='right')
+
+        # a block holding every right key, in order, is matched against the whole index
+        pair_matches = np.full(len(pair_blocks), -1, dtype=np.int64)
+        for start, end, low, high in zip(starts, ends, lows, highs):
+            pairs = left_order[start:end]
+            block_keys = right_pair_keys[low:high]
+            block_index = join_index
+            if not np.array_equal(block_keys, np.arange(len(join_index.keys))):
+                block_index = join_index.subset(block_keys)
+            positions = match_keys(left_keys[pair_keys[pairs]], block_index)
+            pair_matches[pairs] = np.append(block_keys, -1)[positions]
+        return map_codes(left_pairs, pair_matches)
+
+    @classmethod
+    def _join_rows(cls,
+                   left_df: container.DataFrame,
+                   left_col: str,
+                   left_groups: np.ndarray,
+                   right_columns: ColumnStore,
+                   right_cols: typing.Sequence[str],
+                   right_groups: np.ndarray,
+                   row_chunk_size: int,
+                   profile: JoinProfile,
+                   left_values: typing.Optional[typing.Dict[str, np.ndarray]] = None,
+                   left_categories: typing.Optional[LeftCategories] = None) -> container.DataFrame:
+        # inner join each left row to every right row in the same group, with -1 for rows that join nothing - the
+        # joined rows are found as positions in the left and right dataframes, and each output col is taken from
+        # its input col, so neither input is copied or modified along the way, and right cols are only read for the
+        # joined rows.  Left cols are replaced by any supplied left_values in the output, and any in left_categories
+        # are output as categoricals.
+        left_values = left_values or {}
+        left_categories = left_categories or {}
+        with profile.phase('join'):
+            row_groups = group_rows(right_groups)
+            counts = join_counts(left_groups, row_groups)
+            rows = np.flatnonzero(counts > 0)
+
+        # sort on the d3m index if there, otherwise use the joined column - stable, so that left rows with the same
+        # value stay in order, and skipped when the rows are already in order
+        with profile.phase('sort'):
+            sort_col = 'd3mIndex' if 'd3mIndex' in left_df else left_col
+            sort_keys = pd.Series(left_values.get(sort_col, left_df[sort_col].values)[rows])
+            if not sort_keys.is_monotonic_increasing:
+                rows = rows[sort_keys.sort_values(kind='mergesort').index.values]
+
+        # join row_chunk_size left rows at a time, so the positions of the joined rows and the cols taken from them
+        # are only held for one chunk at once - each chunk's cols are copied into cols allocated for the whole
+        # output, or concatenated at the end for cols pandas holds as extension arrays
+        with profile.phase('join'):
+            step = row_chunk_size or max(len(rows), 1)
+            num_joined = int(counts[rows].sum())
+            joined_cols: typing.Dict[str, typing.Any] = collections.OrderedDict()
+            offset = 0
+            for start in range(0, max(len(rows), 1), step):
+                chunk_rows = rows[start:start + step]
+                chunk_positions, right_positions = join_positions(left_groups[chunk_rows], right_groups, row_groups)
+                left_positions = chunk_rows[chunk_positions]
+                for name, taken in cls._take_joined_cols(left_df, right_columns, right_cols, left_positions,
+                                                         right_positions, left_values, left_categories):
+                    if step >= len(rows):
+                        joined_cols[name] = taken
+                    elif isinstance(taken.dtype, np.dtype):
+                        col = joined_cols.setdefault(name, np.empty(num_joined, dtype=taken.dtype))
+                        col[offset:offset + len(taken)] = taken.values
+                    else:
+                        joined_cols.setdefault(name, []).append(taken)
+                offset += len(left_positions)
+            for name, col in list(joined_cols.items()):
+                if isinstance(col, list):
+                    joined_cols[name] = pd.concat(col, ignore_index=True)
+            joined = container.DataFrame(joined_cols)
 
         return joined
 
+    @classmethod
+    def _take_joined_cols(cls,
+                          left_df: container.DataFrame,
+                          right_columns: ColumnStore,
+                          right_cols: typing.Sequence[str],
+                          left_positions: np.ndarray,
+                          right_positions: np.ndarray,
+                          left_values: typing.Dict[str, np.ndarray],
+                          left_categories: LeftCategories) -> typing.Iterator[typing.Tuple[str, pd.Series]]:
+        # output cols of the joined rows at the given positions - use d3mIndex from left col if present, and drop the
+        # right join cols - cols in both get a suffix
+        dropped_cols = set(['d3mIndex'] + list(right_cols))
+        right_names = [col for col in right_columns.columns if col not in dropped_cols]
+        clashing_names = set(left_df.columns).intersection(right_names)
+        for col in left_df.columns:
+            if col in left_categories:
+                codes, categories = left_categories[col]
+                taken = pd.Series(pd.Categorical.from_codes(codes[left_positions], categories))
+            else:
+                values = pd.Series(left_values[col]) if col in left_values else left_df[col]
+                taken = cls._take(values, left_positions)
+            yield col + '_1' if col in clashing_names else col, taken
+        for col in right_names:
+            yield col + '_2' if col in clashing_names else col, right_columns.take(col, right_positions)
+
+    @classmethod
+    def _take(cls, col: pd.Series, positions: np.ndarray) -> pd.Series:
+        # values of a col at the given positions, indexed from 0
+        taken = col.take(positions)
+        taken.index = pd.RangeIndex(len(positions))
+        return taken
+
+    @classmethod
+    def _parse_datetime_col(cls, col: pd.Series) -> typing.Tuple[np.ndarray, np.ndarray]:
+        # parse each distinct value once, letting pandas infer a single format for the whole column and falling
+        # back on dateutil when the values don't share one - times with a timezone are converted to naive UTC
+        # times, so that they can be compared with each other and with times that have none
+        codes, values = pd.factorize(col)
+        try:
+            parsed = pd.to_datetime(values, infer_datetime_format=True, utc=True)
+        except (ValueError, OverflowError):
+            parsed = pd.to_datetime([parser.parse(value) for value in values], utc=True)
+        parsed = parsed.tz_convert(None)
+
+        # distinct strings can parse to the same time, so return codes into the distinct times - with -1 for
+        # missing values
+        parsed_codes, times = pd.factorize(parsed)
+        return map_codes(codes, parsed_codes), np.asarray(times)
+
     @classmethod
     def _datetime_fuzzy_match(cls,
-                              match: np.datetime64,
-                              choices: typing.Sequence[np.datetime64],
-                              tolerance: np.timedelta64) -> typing.Optional[np.datetime64]:
-        min_distance = None
-        min_date = None
-        for i, date in enumerate(choices):
-            distance = abs(match - date)
-            if distance <= tolerance and (min_distance is None or distance < min_distance):
-                min_distance = distance
-                min_date = date
-        return min_date
+                              index: SortedIndex,
+                              matches: np.ndarray,
+                              tolerance: int) -> np.ndarray:
+        # nearest choice within the tolerance, with times as integer nanoseconds
+        return index.nearest(matches, tolerance)
 
     @classmethod
     def _compute_time_range(cls,
@@ -367,3 +1253,58 @@ class FuzzyJoinPrimitive(transformer.TransformerPrimitiveBase[Inputs,
         right_delta = right_max - right_min
 
         return min(left_delta, right_delta)
+
+    @classmethod
+    def _get_points(cls,
+                    columns: ColumnStore,
+                    cols: typing.Sequence[str],
+                    join_types: typing.Sequence[str]) -> np.ndarray:
+        # coordinates of each row's point, with a coordinate per numeric col and one per element of vector cols
+        coords = []
+        for col, join_type in zip(cols, join_types):
+            values = columns.column(col)
+            if join_type in cls._VECTOR_JOIN_TYPES:
+                coords.append(cls._parse_vector_col(values))
+            else:
+                coords.append(pd.to_numeric(values).values.astype(np.float64).reshape(-1, 1))
+        return np.hstack(coords)
+
+    @classmethod
+    def _parse_vector_col(cls, col: pd.Series) -> np.ndarray:
+        # vectors are held as sequences of numbers or as strings of comma separated numbers - missing or empty
+        # vectors have missing coordinates
+        vectors = []
+        for value in col:
+            if isinstance(value, str):
+                value = [item for item in value.split(',') if item.strip()]
+            elif value is None or (np.isscalar(value) and pd.isnull(value)):
+                value = []
+            vectors.append(np.asarray(value, dtype=np.float64).ravel())
+
+        lengths = set(len(vector) for vector in vectors if len(vector) > 0)
+        if len(lengths) > 1:
+            raise exceptions.InvalidArgumentValueError('vectors of lengths ' + str(sorted(lengths)) +
+                                                       ' are not supported')
+        points = np.full((len(vectors), lengths.pop() if lengths else 0), np.nan)
+        for i, vector in enumerate(vectors):
+            if len(vector) > 0:
+                points[i] = vector
+        return points
+
+    @classmethod
+    def _factorize_points(cls, points: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray]:
+        # distinct points, and the code of each row's point into them - with -1 for points missing a coordinate
+        codes = np.full(len(points), -1, dtype=np.int64)
+        valid = np.flatnonzero(~np.isnan(points).any(axis=1))
+        keys, inverse = np.unique(points[valid], axis=0, return_inverse=True)
+        codes[valid] = inverse.reshape(-1)
+        return codes, keys
+
+    @classmethod
+    def _compute_point_range(cls, left: np.ndarray, right: np.ndarray) -> float:
+        # smaller of the diagonals of the left and right points' bounding boxes
+        if len(left) == 0 or len(right) == 0:
+            return 0.0
+        left_delta = np.linalg.norm(left.max(axis=0) - left.min(axis=0))
+        right_delta = np.linalg.norm(right.max(axis=0) - right.min(axis=0))
+        return float(min(left_delta, right_delta))
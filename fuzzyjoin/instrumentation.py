@@ -0,0 +1,83 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import collections
+import time
+import typing
+
+__all__ = ('JoinProfile', 'ProfileHook')
+
+
+class _Phase:
+    # times a block, adding the elapsed time to the named phase of a profile
+
+    def __init__(self, timings: typing.Dict[str, float], name: str) -> None:
+        self._timings = timings
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        self._timings[self._name] = self._timings.get(self._name, 0.0) + time.perf_counter() - self._start
+
+
+class _NullPhase:
+    # stands in for a phase when the profile is disabled, so untimed blocks cost next to nothing
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info: typing.Any) -> None:
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class JoinProfile:
+    """
+    Wall time spent in each phase of a join, in seconds, and counts of the keys, candidate pairs and rows it
+    handled.  A disabled profile records nothing, so joins can be instrumented unconditionally.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.timings: typing.Dict[str, float] = collections.OrderedDict()
+        self.counters: typing.Dict[str, int] = collections.OrderedDict()
+
+    def phase(self, name: str) -> typing.Union[_Phase, _NullPhase]:
+        """
+        Returns a context manager that adds the time spent in its block to the named phase.
+        """
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self.timings, name)
+
+    def count(self, name: str, value: int) -> None:
+        """
+        Adds a value to the named counter.
+        """
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + int(value)
+
+    def __repr__(self) -> str:
+        return 'JoinProfile(timings={timings}, counters={counters})'.format(timings=dict(self.timings),
+                                                                            counters=dict(self.counters))
+
+
+ProfileHook = typing.Callable[[JoinProfile], None]
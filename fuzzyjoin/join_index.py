@@ -0,0 +1,132 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import hashlib
+import os
+import typing
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from fuzzyjoin.kdtree_index import KDTreeIndex
+from fuzzyjoin.qgram_index import QGramIndex
+from fuzzyjoin.sorted_index import SortedIndex
+from fuzzyjoin.storage import atomic_directory, load_arrays, save_arrays
+from fuzzyjoin.tfidf_index import TfidfIndex
+
+__all__ = ('JoinIndex', 'fingerprint')
+
+KeyIndex = typing.Union[QGramIndex, SortedIndex, TfidfIndex, KDTreeIndex]
+
+_KEY_INDEX_TYPES: typing.Dict[str, typing.Type[typing.Any]] = {
+    KDTreeIndex.__name__: KDTreeIndex,
+    QGramIndex.__name__: QGramIndex,
+    SortedIndex.__name__: SortedIndex,
+    TfidfIndex.__name__: TfidfIndex,
+}
+
+_KEY_INDEX_DIR = 'key_index'
+
+
+class JoinIndex:
+    """
+    Prepared right side of a join - the distinct right join keys, the code of each right row's key into them (-1
+    for a missing key), and a fuzzy match index over the keys, which is left out for joins that only match exactly.
+    It's identified by a fingerprint of the right join column and the join settings, so it can be built once and
+    reused by later joins against the same data, and can be saved to a directory and loaded back with its arrays
+    memory mapped.
+    """
+
+    def __init__(self,
+                 fingerprint: typing.Optional[str],
+                 codes: np.ndarray,
+                 keys: np.ndarray,
+                 key_index: typing.Optional[KeyIndex]) -> None:
+        self.fingerprint = fingerprint
+        self.codes = codes
+        self.keys = keys
+        self.key_index = key_index
+
+        # hash lookups of the keys, with and without normalization, built on first use
+        self._exact_lookups: typing.Dict[bool, typing.Tuple[pd.Index, np.ndarray]] = {}
+
+    def exact_matches(self, values: np.ndarray, normalize: bool = False) -> np.ndarray:
+        """
+        Returns the position in the keys of the key equal to each value, or -1 where there is none.  When normalize
+        is set, string keys are compared ignoring case and surrounding or repeated whitespace, and the first of any
+        keys that normalize to the same string is used.
+        """
+        lookup = self._exact_lookups.get(normalize)
+        if lookup is None:
+            keys = _normalize_keys(self.keys) if normalize else self.keys
+            first = np.flatnonzero(~pd.Index(keys).duplicated())
+            lookup = self._exact_lookups[normalize] = pd.Index(keys[first]), np.append(first, -1)
+
+        key_lookup, positions = lookup
+        return positions[key_lookup.get_indexer(_normalize_keys(values) if normalize else values)]
+
+    def subset(self, positions: np.ndarray) -> 'JoinIndex':
+        """
+        Returns a join index over the keys at the given positions, in that order, for matching against part of the
+        right side.  It has no codes, as its keys no longer line up with the right rows, and no fingerprint, as
+        matches against part of the keys aren't worth caching.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        key_index = self.key_index.subset(positions) if self.key_index is not None else None
+        return JoinIndex(None, np.empty(0, dtype=np.int64), self.keys[positions], key_index)
+
+    def save(self, path: str) -> None:
+        """
+        Saves the join index to a directory.
+        """
+        with atomic_directory(path) as temp_path:
+            key_index_type = None
+            if self.key_index is not None:
+                self.key_index.save(os.path.join(temp_path, _KEY_INDEX_DIR))
+                key_index_type = type(self.key_index).__name__
+            save_arrays(temp_path, {'codes': self.codes, 'keys': np.asarray(self.keys)},
+                        {'fingerprint': self.fingerprint, 'key_index_type': key_index_type})
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'JoinIndex':
+        """
+        Loads a join index saved to a directory, memory mapping its arrays if requested.
+        """
+        arrays, attributes = load_arrays(path, mmap)
+        key_index = None
+        if attributes['key_index_type'] is not None:
+            key_index_type = _KEY_INDEX_TYPES[attributes['key_index_type']]
+            key_index = key_index_type.load(os.path.join(path, _KEY_INDEX_DIR), mmap)
+        return cls(attributes['fingerprint'], arrays['codes'], arrays['keys'], key_index)
+
+
+def fingerprint(values: typing.Union[pd.Series, pd.DataFrame], *settings: typing.Any) -> str:
+    """
+    Returns a digest identifying a join column's values, or the rows of several join columns, in order, along with
+    any settings that affect how an index over them is built.
+    """
+    digest = hashlib.sha1(pd.util.hash_pandas_object(values, index=False).values.tobytes())
+    for setting in settings:
+        digest.update(repr(setting).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _normalize_keys(values: np.ndarray) -> np.ndarray:
+    # lower case, with runs of whitespace collapsed to a single space and leading and trailing whitespace removed -
+    # missing values are left missing so they never match
+    series = pd.Series(values, dtype=object)
+    normalized = series.astype(str).str.lower().str.split().str.join(' ')
+    return normalized.where(series.notnull()).values
@@ -0,0 +1,100 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import hashlib
+import sys
+import typing
+
+import numpy as np
+import pandas as pd  # type: ignore
+
+from fuzzyjoin.match_cache import MatchCache
+from fuzzyjoin.storage import atomic_directory, load_arrays, save_arrays
+
+__all__ = ('JoinState', 'advance_state')
+
+
+class JoinState:
+    """
+    What an incremental join of a left table that is only ever appended to remembers between joins - a fingerprint
+    of the right side and join settings, the number of left rows joined so far along with a fingerprint of their
+    join columns, and the string match results of every left key matched so far.  While both fingerprints hold,
+    the next join only needs to join the rows appended since, starting from the row at start.
+    """
+
+    def __init__(self,
+                 right_fingerprint: str,
+                 rows: int,
+                 left_fingerprint: str,
+                 match_cache: MatchCache,
+                 start: int = 0) -> None:
+        self.right_fingerprint = right_fingerprint
+        self.rows = rows
+        self.left_fingerprint = left_fingerprint
+        self.match_cache = match_cache
+        self.start = start
+
+    def save(self, path: str) -> None:
+        """
+        Saves the state to a directory, replacing any state already saved there.
+        """
+        # the match cache is keyed by the fingerprint of a join index and a left key
+        entries = typing.cast(typing.List[typing.Tuple[typing.Tuple[str, typing.Any], int]], self.match_cache.items())
+        keys = np.empty(len(entries), dtype=object)
+        keys[:] = [key for (_, key), _ in entries]
+        arrays = {
+            'fingerprints': np.array([key_fingerprint for (key_fingerprint, _), _ in entries], dtype=str),
+            'keys': keys,
+            'positions': np.array([position for _, position in entries], dtype=np.int64),
+        }
+        with atomic_directory(path, replace=True) as temp_path:
+            save_arrays(temp_path, arrays, {'right_fingerprint': self.right_fingerprint, 'rows': self.rows,
+                                            'left_fingerprint': self.left_fingerprint, 'start': self.start})
+
+    @classmethod
+    def load(cls, path: str) -> 'JoinState':
+        """
+        Loads a state saved to a directory.
+        """
+        arrays, attributes = load_arrays(path, mmap=False)
+        match_cache = MatchCache(sys.maxsize)
+        for key_fingerprint, key, position in zip(arrays['fingerprints'], arrays['keys'], arrays['positions']):
+            match_cache.put((str(key_fingerprint), key), int(position))
+        return cls(attributes['right_fingerprint'], attributes['rows'], attributes['left_fingerprint'], match_cache,
+                   attributes['start'])
+
+
+def advance_state(state: typing.Optional[JoinState],
+                  right_fingerprint: str,
+                  left_keys: pd.DataFrame,
+                  incremental: bool = True) -> JoinState:
+    """
+    Returns the state of a join of every row of the left join columns, with start set to the first row that still
+    needs joining - the first row not joined by the previous state, or 0 when there is no previous state, when
+    the right side has changed, when rows it joined have been modified or removed, or when the join isn't
+    incremental.  String matches are carried over while the right side is unchanged.
+    """
+    # the left fingerprints of the previously joined rows and of every row are taken in a single pass
+    hashes = pd.util.hash_pandas_object(left_keys, index=False).values
+    rows = state.rows if state is not None and state.rows <= len(hashes) else 0
+    digest = hashlib.sha1(hashes[:rows].tobytes())
+    previous_fingerprint = digest.hexdigest()
+    digest.update(hashes[rows:].tobytes())
+
+    if state is None or state.right_fingerprint != right_fingerprint:
+        return JoinState(right_fingerprint, len(hashes), digest.hexdigest(), MatchCache(sys.maxsize))
+    start = rows if incremental and rows == state.rows and previous_fingerprint == state.left_fingerprint else 0
+    return JoinState(right_fingerprint, len(hashes), digest.hexdigest(), state.match_cache, start)
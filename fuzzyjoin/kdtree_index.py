@@ -0,0 +1,83 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import typing
+
+import numpy as np
+
+from fuzzyjoin.storage import load_arrays, save_arrays
+
+__all__ = ('KDTreeIndex',)
+
+# widens the search radius of the tree, whose bound excludes points at exactly that distance - matches are then held
+# to the tolerance itself
+_EPSILON = 1e-9
+
+
+class KDTreeIndex:
+    """
+    K-d tree over a set of unique points, given as a two dimensional array of choices with one row per point.
+    Nearest neighbour lookups for a whole array of points are answered by descending the tree once per point, in
+    O(log n) time for n choices, rather than by comparing each point against every choice.  Distances are
+    euclidean, so the coordinates should share a scale.
+    """
+
+    def __init__(self, choices: np.ndarray) -> None:
+        # scipy is slow to import, so it's only imported once an index is built
+        from scipy import spatial  # type: ignore
+
+        self.choices = np.asarray(choices, dtype=np.float64)
+
+        # points with a missing coordinate are left out of the tree, keeping track of the position of the rest
+        self._positions = np.flatnonzero(~np.isnan(self.choices).any(axis=1))
+        self._tree = spatial.cKDTree(self.choices[self._positions])
+
+    def nearest(self, values: np.ndarray, tolerance: float) -> np.ndarray:
+        """
+        Returns the position in the choices of the nearest choice to each point, or -1 where no choice lies within
+        the tolerance.  When two choices are equally near, either may be used.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        nearest = np.full(len(values), -1, dtype=np.int64)
+        valid = np.flatnonzero(~np.isnan(values).any(axis=1))
+        if len(self._positions) == 0 or len(valid) == 0:
+            return nearest
+
+        distance_bound = tolerance * (1.0 + _EPSILON) if tolerance > 0 else np.inf
+        distances, found = self._tree.query(values[valid], k=1, distance_upper_bound=distance_bound)
+        matched = distances <= tolerance
+        nearest[valid[matched]] = self._positions[found[matched]]
+        return nearest
+
+    def subset(self, positions: np.ndarray) -> 'KDTreeIndex':
+        """
+        Returns an index over the choices at the given positions, in that order.
+        """
+        return KDTreeIndex(self.choices[positions])
+
+    def save(self, path: str) -> None:
+        """
+        Saves the index to a directory.  Only the choices are saved, and the tree is built again when loaded.
+        """
+        save_arrays(path, {'choices': self.choices}, {})
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'KDTreeIndex':
+        """
+        Loads an index saved to a directory, memory mapping its choices if requested.
+        """
+        arrays, _ = load_arrays(path, mmap)
+        return cls(arrays['choices'])
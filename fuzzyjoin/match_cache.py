@@ -0,0 +1,88 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import collections
+import typing
+
+__all__ = ('MatchCache', 'CacheInfo')
+
+CacheInfo = collections.namedtuple('CacheInfo', ['hits', 'misses', 'max_size', 'size'])
+
+_MISSING = object()
+
+
+class MatchCache:
+    """
+    Bounded cache of fuzzy match results that evicts the least recently used entry once full.  Hit and miss
+    counts are kept so the cache can be sized against a workload.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: typing.MutableMapping[typing.Hashable, typing.Any] = collections.OrderedDict()
+
+    def lookup(self, key: typing.Hashable) -> typing.Tuple[bool, typing.Any]:
+        """
+        Returns whether the key is cached and its cached value, marking it as the most recently used entry.
+        """
+        value = self._entries.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)  # type: ignore
+        self.hits += 1
+        return True, value
+
+    def put(self, key: typing.Hashable, value: typing.Any) -> None:
+        """
+        Caches a value, evicting the least recently used entries if the cache is over its maximum size.
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)  # type: ignore
+        self._evict()
+
+    def resize(self, max_size: int) -> None:
+        """
+        Changes the maximum size of the cache, evicting entries if it has shrunk.
+        """
+        self.max_size = max_size
+        self._evict()
+
+    def clear(self) -> None:
+        """
+        Removes all entries and resets the hit and miss counts.
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def items(self) -> typing.List[typing.Tuple[typing.Hashable, typing.Any]]:
+        """
+        Returns the cached keys and values from the least to the most recently used, without counting as lookups.
+        """
+        return list(self._entries.items())
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Returns the hit and miss counts along with the maximum and current size of the cache.
+        """
+        return CacheInfo(self.hits, self.misses, self.max_size, len(self._entries))
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)  # type: ignore
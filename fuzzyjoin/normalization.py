@@ -0,0 +1,104 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import re
+import typing
+import unicodedata
+
+import numpy as np
+
+__all__ = ('NORMALIZERS', 'normalize_keys', 'self_matching')
+
+_NON_WORD = re.compile(r'\W', re.UNICODE)
+
+
+def _default(value: str) -> str:
+    # the processing fuzzywuzzy's extractOne applies to a query before scoring it with WRatio - fuzzywuzzy is only
+    # imported once strings are normalized
+    from fuzzywuzzy import utils
+
+    return utils.full_process(utils.full_process(value), force_ascii=True)
+
+
+def _default_choice(value: str) -> str:
+    # the processing WRatio applies to each of extractOne's choices, which drops non-ascii characters before
+    # punctuation rather than after, so 'Cafe\xa0Bar' becomes 'cafebar' rather than 'cafe bar'
+    from fuzzywuzzy import utils
+
+    return utils.full_process(value, force_ascii=True)
+
+
+def _casefold(value: str) -> str:
+    # keeps non-ascii letters and numbers, which the default processing drops
+    return ' '.join(_NON_WORD.sub(' ', value).casefold().split())
+
+
+def _unicode(value: str) -> str:
+    # folds accented characters onto their unaccented form before the default processing, rather than dropping them
+    decomposed = unicodedata.normalize('NFKD', value)
+    return _default(''.join(char for char in decomposed if not unicodedata.combining(char)))
+
+
+def _token_sort(value: str) -> str:
+    # word order is ignored
+    return ' '.join(sorted(_default(value).split()))
+
+
+NORMALIZERS: typing.Dict[str, typing.Callable[[str], str]] = {
+    'default': _default,
+    'casefold': _casefold,
+    'unicode': _unicode,
+    'token_sort': _token_sort,
+}
+
+# normalizers whose choices, the right keys, are processed differently to the keys matched against them
+_CHOICE_NORMALIZERS: typing.Dict[str, typing.Callable[[str], str]] = {
+    'default': _default_choice,
+}
+
+
+def normalize_keys(keys: typing.Sequence[typing.Any], normalization: str, choices: bool = False) -> np.ndarray:
+    """
+    Returns an object array of each key converted to a string and normalized by the named normalizer, so that the
+    strings compared by fuzzy matching only need to be normalized once.  Choices, the keys that others are matched
+    against, are normalized in the form the normalizer gives choices when it has one.
+    """
+    normalizer = NORMALIZERS[normalization]
+    if choices:
+        normalizer = _CHOICE_NORMALIZERS.get(normalization, normalizer)
+    normalized = np.empty(len(keys), dtype=object)
+    for i, key in enumerate(keys):
+        normalized[i] = normalizer(str(key))
+    return normalized
+
+
+def self_matching(keys: typing.Sequence[typing.Any], normalization: str) -> np.ndarray:
+    """
+    Returns whether each key normalizes to the same string as it does as a choice, and so scores 100 against an
+    equal choice when it isn't empty.  Only keys with non-ascii characters can differ, under the default
+    normalization.
+    """
+    matching = np.ones(len(keys), dtype=bool)
+    choice_normalizer = _CHOICE_NORMALIZERS.get(normalization)
+    if choice_normalizer is not None:
+        normalizer = NORMALIZERS[normalization]
+        for i, key in enumerate(keys):
+            value = str(key)
+            try:
+                value.encode('ascii')
+            except UnicodeEncodeError:
+                matching[i] = normalizer(value) == choice_normalizer(value)
+    return matching
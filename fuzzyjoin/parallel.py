@@ -0,0 +1,89 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import contextlib
+import functools
+import multiprocessing
+import os
+import typing
+
+import numpy as np
+
+from fuzzyjoin.budget import JoinBudget
+
+__all__ = ('MatchFunction', 'map_chunks')
+
+MatchFunction = typing.Callable[[typing.Any, np.ndarray], np.ndarray]
+
+# state installed in each worker process by _init_worker
+_worker_function: typing.Optional[MatchFunction] = None
+_worker_shared: typing.Any = None
+
+
+def map_chunks(function: MatchFunction,
+               shared: typing.Any,
+               keys: np.ndarray,
+               n_jobs: int,
+               chunk_size: int,
+               budget: typing.Optional[JoinBudget] = None,
+               fill: typing.Any = -1) -> np.ndarray:
+    """
+    Applies `function(shared, chunk)` to consecutive chunks of the keys and concatenates the results in key order.
+    With more than one job the chunks are processed by a pool of worker processes.  The shared argument (typically
+    the right side match index) is handed to each worker once when the pool starts, rather than being pickled with
+    every chunk.  An n_jobs of -1 uses every available core.  Each chunk is charged to the budget, if given, and
+    once it's exhausted the results for the keys that are left are set to the fill value.
+    """
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    if (budget is None or not budget.active) and (n_jobs == 1 or len(keys) <= chunk_size):
+        return function(shared, keys)
+
+    chunks = [keys[start:start + chunk_size] for start in range(0, len(keys), chunk_size)]
+
+    # an empty result gives the dtype of the fill, should the budget run out before a chunk is matched
+    results = [function(shared, keys[:0])]
+    with contextlib.ExitStack() as stack:
+        # chunks are matched lazily, and leaving the pool early terminates its workers
+        matched: typing.Iterator[np.ndarray]
+        if n_jobs == 1 or len(chunks) <= 1:
+            matched = map(functools.partial(function, shared), chunks)
+        else:
+            pool = stack.enter_context(multiprocessing.Pool(min(n_jobs, len(chunks)),
+                                                            initializer=_init_worker,
+                                                            initargs=(function, shared)))
+            matched = pool.imap(_map_chunk, chunks)
+        for chunk in chunks:
+            if budget is not None and not budget.check():
+                break
+            results.append(next(matched))
+            if budget is not None:
+                budget.spend(len(chunk))
+
+    values = np.concatenate(results)
+    if len(values) < len(keys):
+        values = np.concatenate([values, np.full(len(keys) - len(values), fill, dtype=values.dtype)])
+    return values
+
+
+def _init_worker(function: MatchFunction, shared: typing.Any) -> None:
+    global _worker_function, _worker_shared
+    _worker_function = function
+    _worker_shared = shared
+
+
+def _map_chunk(chunk: np.ndarray) -> np.ndarray:
+    return _worker_function(_worker_shared, chunk)  # type: ignore
@@ -0,0 +1,231 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import collections
+import math
+import typing
+
+import numpy as np
+
+from fuzzyjoin.storage import load_arrays, save_arrays
+
+__all__ = ('QGramIndex',)
+
+# Guards the ceil() of the float bounds below against round-off.
+_EPSILON = 1e-9
+
+# Every WRatio component other than the base ratio is scaled by at most 0.95.
+_MAX_SCALED_SCORE = 95
+
+
+class QGramIndex:
+    """
+    Inverted q-gram index over a set of normalized string choices.  Given a normalized query it returns the
+    positions of the choices that can possibly reach the minimum `fuzzywuzzy.fuzz.WRatio` score against it (with
+    WRatio's own processing turned off), using count and length filtering derived from the score.  Every pruned
+    choice is guaranteed to score below the minimum, so finding the best scoring candidate gives the same result
+    as scoring all of the choices.
+
+    Above a score of 95 only the base ratio of WRatio can qualify a pair, and q-grams of the strings
+    are used directly.  At or below 95 the token based WRatio components can qualify pairs that share a whole
+    token regardless of their characters, so those are always kept, and the remaining pairs are filtered on
+    their character (q=1) overlap.
+    """
+
+    def __init__(self,
+                 choices: typing.Sequence[str],
+                 min_score: float,
+                 q: int = 2) -> None:
+        self.choices = choices
+        self.min_score = min_score
+        # WRatio scores are integers
+        self._min_score = math.ceil(min_score - _EPSILON)
+        self._ratio_only = self._min_score > _MAX_SCALED_SCORE
+        self._q = q if self._ratio_only else 1
+
+        self._lengths = np.array([len(choice) for choice in choices], dtype=np.int64)
+        self._token_lengths = np.array([len(_token_set_string(choice)) for choice in choices], dtype=np.int64)
+        self._grams, self._gram_offsets, self._gram_postings, self._gram_counts = \
+            self._build_postings([_qgrams(choice, self._q) for choice in choices])
+        if not self._ratio_only:
+            self._tokens, self._token_offsets, self._token_postings, _ = \
+                self._build_postings([collections.Counter(choice.split()) for choice in choices])
+        self._first_equal: typing.Optional[np.ndarray] = None
+        # choices of the indexed choices that a subset keeps, sorted, with their positions in the subset
+        self._subset: typing.Optional[typing.Tuple[np.ndarray, np.ndarray]] = None
+
+    def candidates(self, processed: str) -> np.ndarray:
+        """
+        Returns the sorted positions of the choices that could score at least the minimum score
+        against the supplied normalized value.
+        """
+        if len(processed) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        # number of q-grams each choice has in common with the match
+        overlap = np.zeros(len(self._lengths), dtype=np.int64)
+        for gram, count in _qgrams(processed, self._q).items():
+            gram_id = self._grams.get(gram)
+            if gram_id is not None:
+                posting = slice(self._gram_offsets[gram_id], self._gram_offsets[gram_id + 1])
+                choice_ids, kept = self._subset_positions(self._gram_postings[posting])
+                overlap[choice_ids] += np.minimum(self._gram_counts[posting][kept], count)
+
+        if self._ratio_only:
+            # ratio = 2 * lcs / total, and a common subsequence of length lcs split into at most
+            # (total - 2 * lcs + 1) runs shares at least lcs - (q - 1) * runs q-grams
+            min_ratio = (self._min_score - 0.5) / 100.0
+            total = self._lengths + len(processed)
+            shortest = np.minimum(self._lengths, len(processed))
+            min_common = np.ceil(min_ratio * total / 2.0 - _EPSILON)
+            min_overlap = min_common * (2 * self._q - 1) - (self._q - 1) * (total + 1)
+            mask = (shortest >= min_common) & (overlap >= min_overlap)
+        else:
+            # any component ratio of r, taken between strings no shorter than the de-duplicated token
+            # strings, requires a character overlap of at least r * shortest / (2 - r)
+            min_ratio = (self._min_score - 1.0) / 100.0
+            shortest = np.minimum(self._token_lengths, len(_token_set_string(processed)))
+            min_overlap = np.ceil(min_ratio * shortest / (2.0 - min_ratio) - _EPSILON)
+            mask = overlap >= min_overlap
+            for token in set(processed.split()):
+                token_id = self._tokens.get(token)
+                if token_id is not None:
+                    posting = slice(self._token_offsets[token_id], self._token_offsets[token_id + 1])
+                    mask[self._subset_positions(self._token_postings[posting])[0]] = True
+
+        # WRatio is 0 for empty choices
+        mask &= self._lengths > 0
+        return np.flatnonzero(mask)
+
+    def first_equal(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Returns the position of the first choice equal to the choice at each of the given positions, which is the
+        first choice that a query scoring 100 against them scores 100 against.
+        """
+        if self._first_equal is None:
+            _, first, inverse = np.unique(np.asarray(self.choices), return_index=True, return_inverse=True)
+            self._first_equal = first[inverse]
+        return self._first_equal[positions]
+
+    def subset(self, positions: np.ndarray) -> 'QGramIndex':
+        """
+        Returns an index over the choices at the given positions, in that order.  It shares this index's posting
+        lists, keeping only the postings of its own choices, so it's built without tokenizing the choices again.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        index = QGramIndex.__new__(QGramIndex)
+        index.__dict__.update(self.__dict__)
+        index.choices = np.asarray(self.choices)[positions]
+        index._lengths = self._lengths[positions]
+        index._token_lengths = self._token_lengths[positions]
+        index._first_equal = None
+
+        # positions in this index's postings are mapped to positions in the subset by searching its sorted choices
+        if self._subset is not None:
+            positions = self._subset[0][np.argsort(self._subset[1])][positions]
+        order = np.argsort(positions, kind='mergesort')
+        index._subset = positions[order], order
+        return index
+
+    def save(self, path: str) -> None:
+        """
+        Saves the index to a directory.
+        """
+        arrays = {
+            'choices': np.asarray(self.choices),
+            'lengths': self._lengths,
+            'token_lengths': self._token_lengths,
+            'grams': np.array(list(self._grams), dtype=str),
+            'gram_offsets': self._gram_offsets,
+            'gram_postings': self._gram_postings,
+            'gram_counts': self._gram_counts,
+        }
+        if not self._ratio_only:
+            arrays.update({
+                'tokens': np.array(list(self._tokens), dtype=str),
+                'token_offsets': self._token_offsets,
+                'token_postings': self._token_postings,
+            })
+        save_arrays(path, arrays, {'min_score': self.min_score, 'q': self._q})
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'QGramIndex':
+        """
+        Loads an index saved to a directory, memory mapping its posting lists if requested.
+        """
+        arrays, attributes = load_arrays(path, mmap)
+
+        index = cls.__new__(cls)
+        index.choices = arrays['choices']
+        index.min_score = attributes['min_score']
+        index._min_score = math.ceil(index.min_score - _EPSILON)
+        index._ratio_only = index._min_score > _MAX_SCALED_SCORE
+        index._q = attributes['q']
+        index._lengths = arrays['lengths']
+        index._token_lengths = arrays['token_lengths']
+        index._grams = {gram: gram_id for gram_id, gram in enumerate(arrays['grams'])}
+        index._gram_offsets = arrays['gram_offsets']
+        index._gram_postings = arrays['gram_postings']
+        index._gram_counts = arrays['gram_counts']
+        index._first_equal = None
+        index._subset = None
+        if not index._ratio_only:
+            index._tokens = {token: token_id for token_id, token in enumerate(arrays['tokens'])}
+            index._token_offsets = arrays['token_offsets']
+            index._token_postings = arrays['token_postings']
+        return index
+
+    def _subset_positions(self, posting: np.ndarray) -> typing.Tuple[np.ndarray, typing.Union[np.ndarray, slice]]:
+        # positions of the choices in a posting list that this index keeps, along with which of the postings they are
+        if self._subset is None:
+            return posting, slice(None)
+        kept_choices, order = self._subset
+        found = np.searchsorted(kept_choices, posting)
+        kept = found < len(kept_choices)
+        kept[kept] = kept_choices[found[kept]] == posting[kept]
+        return order[found[kept]], kept
+
+    @classmethod
+    def _build_postings(cls,
+                        gram_counts: typing.Sequence[typing.Mapping[str, int]]) \
+            -> typing.Tuple[typing.Dict[str, int], np.ndarray, np.ndarray, np.ndarray]:
+        # flatten the per-choice gram counts and group them by gram into a compressed posting list
+        vocabulary: typing.Dict[str, int] = {}
+        gram_ids: typing.List[int] = []
+        choice_ids: typing.List[int] = []
+        counts: typing.List[int] = []
+        for choice_id, grams in enumerate(gram_counts):
+            for gram, count in grams.items():
+                gram_ids.append(vocabulary.setdefault(gram, len(vocabulary)))
+                choice_ids.append(choice_id)
+                counts.append(count)
+
+        gram_id_array = np.array(gram_ids, dtype=np.int64)
+        order = np.argsort(gram_id_array, kind='mergesort')
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(gram_id_array, minlength=len(vocabulary)))
+
+        return vocabulary, offsets, np.array(choice_ids, dtype=np.int64)[order], \
+            np.array(counts, dtype=np.int64)[order]
+
+
+def _qgrams(value: str, q: int) -> typing.Counter[str]:
+    return collections.Counter(value[i:i + q] for i in range(len(value) - q + 1))
+
+
+def _token_set_string(value: str) -> str:
+    # shortest string WRatio compares for a value - its unique tokens joined by single spaces
+    return ' '.join(set(value.split()))
@@ -0,0 +1,66 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+from fuzzywuzzy import fuzz, utils
+
+__all__ = ('wratio',)
+
+# WRatio scales its token based components by 0.95, and its partial components by a further 0.9 once one string is
+# 1.5 times the length of the other, or by 0.6 once it is 8 times the length
+_UNBASE_SCALE = 0.95
+_PARTIAL_SCALE = 0.9
+_LONG_PARTIAL_SCALE = 0.6
+
+
+def wratio(s1: str, s2: str, score_cutoff: float = 0) -> int:
+    """
+    Returns `fuzzywuzzy.fuzz.WRatio` of two already processed strings, for any score of at least score_cutoff.
+    Lower scores are only guaranteed to be below the cutoff - pairs whose lengths alone rule out the cutoff are
+    rejected without computing an edit distance, and the token and partial ratios are skipped whenever they can't
+    change the outcome.
+    """
+    len1 = len(s1)
+    len2 = len(s2)
+    if len1 == 0 or len2 == 0:
+        return 0
+    shortest = min(len1, len2)
+    len_ratio = float(max(len1, len2)) / shortest
+
+    # the base ratio is at most 2 * shortest / total, and the other components are bounded by their scales
+    if len_ratio < 1.5:
+        max_unbase = 100 * _UNBASE_SCALE
+    elif len_ratio > 8:
+        max_unbase = 100 * _LONG_PARTIAL_SCALE
+    else:
+        max_unbase = 100 * _PARTIAL_SCALE
+    max_base = utils.intr(200.0 * shortest / (len1 + len2))
+    if max(max_base, utils.intr(max_unbase)) < score_cutoff:
+        return 0
+
+    base = fuzz.ratio(s1, s2)
+    if base >= max_unbase or max(base, utils.intr(max_unbase)) < score_cutoff:
+        return base
+
+    if len_ratio < 1.5:
+        tsor = fuzz.token_sort_ratio(s1, s2, full_process=False) * _UNBASE_SCALE
+        tser = fuzz.token_set_ratio(s1, s2, full_process=False) * _UNBASE_SCALE
+        return utils.intr(max(base, tsor, tser))
+
+    partial_scale = _LONG_PARTIAL_SCALE if len_ratio > 8 else _PARTIAL_SCALE
+    partial = fuzz.partial_ratio(s1, s2) * partial_scale
+    ptsor = fuzz.partial_token_sort_ratio(s1, s2, full_process=False) * _UNBASE_SCALE * partial_scale
+    ptser = fuzz.partial_token_set_ratio(s1, s2, full_process=False) * _UNBASE_SCALE * partial_scale
+    return utils.intr(max(base, partial, ptsor, ptser))
@@ -0,0 +1,95 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import typing
+
+import numpy as np
+
+from fuzzyjoin.storage import load_arrays, save_arrays
+
+__all__ = ('SortedIndex',)
+
+
+class SortedIndex:
+    """
+    Sorted array over a set of unique numeric choices.  Nearest neighbour lookups for a whole array of values
+    are answered with a single binary search, rather than a scan of the choices per value.
+    """
+
+    def __init__(self, choices: np.ndarray) -> None:
+        self.choices = np.asarray(choices)
+
+        # sort the non-null choices, keeping track of their position in the original array
+        valid = np.flatnonzero(~np.isnan(self.choices))
+        self._order = valid[np.argsort(self.choices[valid], kind='mergesort')]
+        self._sorted = self.choices[self._order]
+
+    def nearest(self,
+                values: np.ndarray,
+                tolerance: typing.Union[np.ndarray, typing.Any]) -> np.ndarray:
+        """
+        Returns the position in the choices of the nearest choice to each value, or -1 where no choice lies
+        within the tolerance.  When two choices are equally near, the one that appears first in the choices
+        is used.
+        """
+        values = np.asarray(values)
+        num_sorted = len(self._sorted)
+        if num_sorted == 0:
+            return np.full(len(values), -1, dtype=np.int64)
+
+        # nearest neighbour is either side of the insertion point
+        upper = np.searchsorted(self._sorted, values)
+        has_upper = upper < num_sorted
+        has_lower = upper > 0
+        lower = np.maximum(upper - 1, 0)
+        upper = np.minimum(upper, num_sorted - 1)
+        upper_distance = self._sorted[upper] - values
+        lower_distance = values - self._sorted[lower]
+
+        use_upper = has_upper & (~has_lower |
+                                 (upper_distance < lower_distance) |
+                                 ((upper_distance == lower_distance) & (self._order[upper] < self._order[lower])))
+        nearest = np.where(use_upper, upper, lower)
+        distance = np.where(use_upper, upper_distance, lower_distance)
+
+        # comparisons against null values or tolerances are false, so they never match
+        found = (has_upper | has_lower) & (distance <= tolerance)
+        return np.where(found, self._order[nearest], -1)
+
+    def subset(self, positions: np.ndarray) -> 'SortedIndex':
+        """
+        Returns an index over the choices at the given positions, in that order.
+        """
+        return SortedIndex(self.choices[positions])
+
+    def save(self, path: str) -> None:
+        """
+        Saves the index to a directory.
+        """
+        save_arrays(path, {'choices': self.choices, 'order': self._order, 'sorted': self._sorted}, {})
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'SortedIndex':
+        """
+        Loads an index saved to a directory, memory mapping its arrays if requested.
+        """
+        arrays, _ = load_arrays(path, mmap)
+
+        index = cls.__new__(cls)
+        index.choices = arrays['choices']
+        index._order = arrays['order']
+        index._sorted = arrays['sorted']
+        return index
@@ -0,0 +1,64 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import os
+import typing
+
+__all__ = ('read_git_commit',)
+
+_GIT_DIR = '.git'
+_REF_PREFIX = 'ref: '
+_PACKED_REFS = 'packed-refs'
+
+
+def read_git_commit(path: str) -> typing.Optional[str]:
+    """
+    Returns the commit checked out in the git repository holding a path, read from the repository's files rather
+    than by running git, or None when there is no repository or its layout isn't one this reads - a worktree or
+    submodule, or a symbolic reference that can't be found.
+    """
+    # the nearest .git holds the repository - in a worktree or submodule it's a file pointing elsewhere, which
+    # isn't read, rather than carrying on to an enclosing repository
+    path = os.path.abspath(path)
+    while not os.path.exists(os.path.join(path, _GIT_DIR)):
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+    git_dir = os.path.join(path, _GIT_DIR)
+    if not os.path.isdir(git_dir):
+        return None
+
+    # HEAD holds either a detached commit or the name of the checked out branch, whose commit is in a file of its
+    # own or, once git has packed it, a line of the packed refs
+    try:
+        with open(os.path.join(git_dir, 'HEAD')) as head_file:
+            head = head_file.read().strip()
+        if not head.startswith(_REF_PREFIX):
+            return head
+        ref = head[len(_REF_PREFIX):]
+        ref_path = os.path.join(git_dir, *ref.split('/'))
+        if os.path.isfile(ref_path):
+            with open(ref_path) as ref_file:
+                return ref_file.read().strip()
+        with open(os.path.join(git_dir, _PACKED_REFS)) as packed_file:
+            for line in packed_file:
+                commit, _, name = line.strip().partition(' ')
+                if name == ref:
+                    return commit
+    except OSError:
+        pass
+    return None
@@ -0,0 +1,138 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import contextlib
+import json
+import os
+import shutil
+import typing
+
+import numpy as np
+
+__all__ = ('save_arrays', 'load_arrays', 'atomic_directory')
+
+_ATTRIBUTES_FILE = 'attributes.json'
+_ARRAY_EXTENSION = '.npy'
+_OBJECT_ARRAYS_ATTRIBUTE = 'object_arrays'
+_STRING_ARRAYS_ATTRIBUTE = 'string_arrays'
+_OFFSETS_SUFFIX = '.offsets'
+
+# strings are saved at a fixed width unless padding them to the longest would more than double their size
+_MAX_PADDING = 2
+
+
+def save_arrays(path: str,
+                arrays: typing.Dict[str, np.ndarray],
+                attributes: typing.Dict[str, typing.Any]) -> None:
+    """
+    Saves a set of named arrays as .npy files in a directory, along with a JSON document of scalar attributes.
+    Arrays of python strings are saved as fixed width strings so they can be memory mapped, unless padding every
+    string to the longest would waste too much space, when they're saved as a single UTF-8 buffer along with the
+    offset of each string in it.  Any other arrays of python objects are pickled, and are listed in the attributes
+    as the only arrays load_arrays will unpickle.
+    """
+    os.makedirs(path, exist_ok=True)
+    object_arrays = []
+    string_arrays = []
+    for name, array in arrays.items():
+        if array.dtype.hasobject and all(isinstance(value, str) for value in array.flat):
+            lengths = np.array([len(value) for value in array.flat], dtype=np.int64)
+            if len(lengths) == 0 or lengths.max() * len(lengths) <= _MAX_PADDING * lengths.sum():
+                array = array.astype(str)
+            else:
+                encoded = [value.encode('utf-8') for value in array.flat]
+                offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+                offsets[1:] = np.cumsum([len(value) for value in encoded])
+                np.save(os.path.join(path, name + _OFFSETS_SUFFIX + _ARRAY_EXTENSION), offsets)
+                array = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+                string_arrays.append(name)
+        elif array.dtype.hasobject:
+            object_arrays.append(name)
+        np.save(os.path.join(path, name + _ARRAY_EXTENSION), array, allow_pickle=array.dtype.hasobject)
+    with open(os.path.join(path, _ATTRIBUTES_FILE), 'w') as attributes_file:
+        json.dump(dict(attributes, **{_OBJECT_ARRAYS_ATTRIBUTE: object_arrays,
+                                      _STRING_ARRAYS_ATTRIBUTE: string_arrays}), attributes_file)
+
+
+def load_arrays(path: str,
+                mmap: bool = True) -> typing.Tuple[typing.Dict[str, np.ndarray], typing.Dict[str, typing.Any]]:
+    """
+    Loads the arrays and attributes written by save_arrays.  Arrays are memory mapped read-only when mmap is set,
+    apart from the arrays of python objects save_arrays listed, which can't be mapped and are read into memory, and
+    the strings it saved in a UTF-8 buffer, which are decoded into an array of python strings.  No other array is
+    unpickled.
+    """
+    with open(os.path.join(path, _ATTRIBUTES_FILE)) as attributes_file:
+        attributes = json.load(attributes_file)
+    object_arrays = set(attributes.pop(_OBJECT_ARRAYS_ATTRIBUTE, ()))
+    string_arrays = set(attributes.pop(_STRING_ARRAYS_ATTRIBUTE, ()))
+    offset_arrays = set(name + _OFFSETS_SUFFIX for name in string_arrays)
+
+    arrays = {}
+    for filename in os.listdir(path):
+        if filename.endswith(_ARRAY_EXTENSION):
+            name = filename[:-len(_ARRAY_EXTENSION)]
+            array_path = os.path.join(path, filename)
+            if name in object_arrays:
+                arrays[name] = np.load(array_path, allow_pickle=True)
+            elif name in string_arrays:
+                offsets = np.load(os.path.join(path, name + _OFFSETS_SUFFIX + _ARRAY_EXTENSION))
+                arrays[name] = _decode_strings(np.load(array_path, mmap_mode='r'), offsets)
+            elif name not in offset_arrays:
+                arrays[name] = np.load(array_path, mmap_mode='r' if mmap else None)
+
+    return arrays, attributes
+
+
+def _decode_strings(buffer: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    # the strings at the given offsets of a UTF-8 buffer, as an array of python strings
+    data = buffer.tobytes()
+    bounds = offsets.tolist()
+    strings = np.empty(len(offsets) - 1, dtype=object)
+    strings[:] = [data[start:end].decode('utf-8') for start, end in zip(bounds[:-1], bounds[1:])]
+    return strings
+
+
+@contextlib.contextmanager
+def atomic_directory(path: str, replace: bool = False) -> typing.Iterator[str]:
+    """
+    Yields a temporary directory that is renamed to the supplied path once the block completes, so concurrent
+    readers never see a partially written directory.  If another process created the path first its copy is kept,
+    unless replace is set, in which case an existing copy is moved aside and removed once the new one is in place.
+    """
+    temp_path = '{path}.{pid}.tmp'.format(path=path.rstrip(os.sep), pid=os.getpid())
+    os.makedirs(temp_path)
+    try:
+        yield temp_path
+    except BaseException:
+        shutil.rmtree(temp_path, ignore_errors=True)
+        raise
+
+    # a directory can't be renamed over one that isn't empty
+    old_path = None
+    if replace and os.path.isdir(path):
+        old_path = '{path}.{pid}.old'.format(path=path.rstrip(os.sep), pid=os.getpid())
+        os.rename(path, old_path)
+
+    try:
+        os.rename(temp_path, path)
+    except OSError:
+        shutil.rmtree(temp_path)
+        if not os.path.isdir(path):
+            raise
+
+    if old_path is not None:
+        shutil.rmtree(old_path)
@@ -0,0 +1,91 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+
+import unittest
+
+import numpy as np
+
+from fuzzyjoin.blocking import block_pairs, compact_codes, group_rows, join_counts, join_positions, map_codes, \
+    refine_blocks
+
+
+class BlockingTestCase(unittest.TestCase):
+
+    def test_block_pairs(self) -> None:
+        blocks = np.array([0, 0, 1, 1, -1, 1], dtype=np.int64)
+        codes = np.array([2, 2, 2, 0, 1, -1], dtype=np.int64)
+        pair_of_row, pair_blocks, pair_codes = block_pairs(blocks, codes)
+        self.assertListEqual(list(pair_of_row), [0, 0, 1, 2, -1, -1])
+        self.assertListEqual(list(pair_blocks), [0, 1, 1])
+        self.assertListEqual(list(pair_codes), [2, 2, 0])
+
+    def test_refine_blocks(self) -> None:
+        # two right blocks, each holding keys 0 and 1
+        right_blocks = np.array([0, 0, 1, 1, 1], dtype=np.int64)
+        right_codes = np.array([0, 1, 0, 1, 1], dtype=np.int64)
+        left_blocks = np.array([0, 1, 1, -1, 0, 1], dtype=np.int64)
+        left_matches = np.array([1, 1, 0, 0, -1, 2], dtype=np.int64)
+        left_blocks, right_blocks = refine_blocks(left_blocks, left_matches, right_blocks, right_codes)
+        self.assertListEqual(list(right_blocks), [0, 1, 2, 3, 3])
+        self.assertListEqual(list(left_blocks), [1, 3, 2, -1, -1, -1])
+
+    def test_join_positions(self) -> None:
+        left_groups = np.array([1, -1, 0, 2, 1], dtype=np.int64)
+        right_groups = np.array([0, 1, -1, 1, 0], dtype=np.int64)
+        left_positions, right_positions = join_positions(left_groups, right_groups)
+        self.assertListEqual(list(left_positions), [0, 0, 2, 2, 4, 4])
+        self.assertListEqual(list(right_positions), [1, 3, 0, 4, 1, 3])
+
+    def test_group_rows(self) -> None:
+        right_groups = np.array([2, 0, -1, 2, 0], dtype=np.int64)
+        order, starts, counts = group_rows(right_groups)
+        self.assertListEqual(list(order), [1, 4, 0, 3])
+        self.assertListEqual(list(starts), [0, 2, 2])
+        self.assertListEqual(list(counts), [2, 0, 2])
+
+        # left rows can be joined in parts against the same grouped rows
+        left_groups = np.array([0, 3, 2, -1, 1], dtype=np.int64)
+        self.assertListEqual(list(join_counts(left_groups, (order, starts, counts))), [2, 0, 2, 0, 0])
+        left_positions, right_positions = join_positions(left_groups[2:], right_groups, (order, starts, counts))
+        self.assertListEqual(list(left_positions), [0, 0])
+        self.assertListEqual(list(right_positions), [0, 3])
+
+    def test_map_codes(self) -> None:
+        codes = np.array([2, -1, 0, 2, 1], dtype=np.int64)
+        mapped = map_codes(codes, np.array([3, -1, 0], dtype=np.int64))
+        self.assertEqual(mapped.dtype, np.int32)
+        self.assertListEqual(list(mapped), [0, -1, 3, 0, -1])
+
+        # codes too large for int32 are left as they are
+        large = np.array([0, 2 ** 40], dtype=np.int64)
+        self.assertEqual(compact_codes(large).dtype, np.int64)
+        self.assertEqual(compact_codes(np.empty(0, dtype=np.int64)).dtype, np.int32)
+
+    def test_empty(self) -> None:
+        empty = np.empty(0, dtype=np.int64)
+        left_blocks, right_blocks = refine_blocks(np.zeros(2, dtype=np.int64), np.zeros(2, dtype=np.int64),
+                                                  empty, empty)
+        self.assertListEqual(list(left_blocks), [-1, -1])
+        self.assertListEqual(list(right_blocks), [])
+
+        left_positions, right_positions = join_positions(np.array([1, -1], dtype=np.int64), empty)
+        self.assertListEqual(list(left_positions), [])
+        self.assertListEqual(list(right_positions), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
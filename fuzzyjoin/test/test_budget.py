@@ -0,0 +1,64 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import unittest
+import typing
+
+from fuzzyjoin.budget import JoinBudget
+
+
+class JoinBudgetTestCase(unittest.TestCase):
+
+    def test_unlimited(self) -> None:
+        budget = JoinBudget()
+        self.assertFalse(budget.active)
+        for _ in range(3):
+            self.assertTrue(budget.check())
+            budget.spend(10)
+        self.assertEqual(budget.iterations_done, 3)
+        self.assertEqual(budget.keys_done, 30)
+        self.assertFalse(budget.exhausted)
+
+    def test_iterations(self) -> None:
+        progress: typing.List[typing.Tuple[int, int]] = []
+        budget = JoinBudget(iterations=2, hooks=[lambda b: progress.append((b.iterations_done, b.keys_done))])
+        self.assertTrue(budget.active)
+
+        # the budget is only exhausted once an iteration is turned away
+        self.assertTrue(budget.check())
+        budget.spend(5)
+        self.assertTrue(budget.check())
+        budget.spend(3)
+        self.assertFalse(budget.exhausted)
+        self.assertFalse(budget.check())
+        self.assertTrue(budget.exhausted)
+        self.assertListEqual(progress, [(1, 5), (2, 8)])
+
+    def test_timeout(self) -> None:
+        budget = JoinBudget(timeout=0.0)
+        with self.assertRaises(TimeoutError):
+            budget.check()
+
+        budget = JoinBudget(timeout=0.0, partial=True)
+        self.assertFalse(budget.check())
+        self.assertTrue(budget.exhausted)
+
+        budget = JoinBudget(timeout=60.0)
+        self.assertTrue(budget.check())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import unittest
+import tempfile
+from os import path
+
+import numpy as np
+import pandas as pd
+
+from fuzzyjoin.column_store import FrameColumnStore, NpyColumnStore, open_column_store, save_column_store
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+class ColumnStoreTestCase(unittest.TestCase):
+
+    _df = pd.DataFrame({
+        'd3mIndex': [0, 1, 2, 3, 4],
+        'alpha col': ['yankee', 'hotel', None, 'foxtrot', 'golf'],
+        'bravo': [1.5, 2.5, np.nan, 4.5, 5.5],
+    })
+
+    def test_frame_store(self) -> None:
+        store = FrameColumnStore(self._df.set_index(pd.Index([10, 11, 12, 13, 14])))
+
+        self.assertEqual(len(store), 5)
+        self.assertListEqual(store.columns, ['d3mIndex', 'alpha col', 'bravo'])
+        self.assertListEqual(list(store.column('d3mIndex').index), [0, 1, 2, 3, 4])
+        taken = store.take('alpha col', np.array([3, 0, 3]))
+        self.assertListEqual(list(taken), ['foxtrot', 'yankee', 'foxtrot'])
+        self.assertListEqual(list(taken.index), [0, 1, 2])
+
+    def test_npy_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store_path = path.join(temp_dir, 'store')
+            save_column_store(self._df, store_path)
+            store = open_column_store(store_path)
+
+            self.assertIsInstance(store, NpyColumnStore)
+            self.assertIsInstance(store._arrays['alpha col'], np.memmap)
+            self.assertEqual(len(store), 5)
+            self.assertListEqual(store.columns, ['d3mIndex', 'alpha col', 'bravo'])
+
+            # strings come back as python strings, with missing values as empty strings
+            self.assertListEqual(list(store.column('alpha col')), ['yankee', 'hotel', '', 'foxtrot', 'golf'])
+            self.assertEqual(store.column('alpha col').dtype, np.object_)
+            self.assertListEqual(list(store.take('d3mIndex', np.array([4, 1]))), [4, 1])
+            self.assertListEqual(list(store.take('bravo', np.array([3, 0]))), [4.5, 1.5])
+            self.assertEqual(len(store.take('bravo', np.empty(0, dtype=np.int64))), 0)
+
+    def test_frame_fingerprint(self) -> None:
+        fingerprint = FrameColumnStore(self._df).fingerprint()
+
+        # the index isn't part of the fingerprint, but the values are, including python objects that can't be hashed
+        self.assertEqual(FrameColumnStore(self._df.set_index(pd.Index([10, 11, 12, 13, 14]))).fingerprint(),
+                         fingerprint)
+        self.assertNotEqual(FrameColumnStore(self._df.assign(bravo=[1.5, 2.5, 3.5, 4.5, 5.5])).fingerprint(),
+                            fingerprint)
+        list_df = self._df.assign(vector=[[1, 2], [3], [], [4], [5, 6]])
+        self.assertNotEqual(FrameColumnStore(list_df).fingerprint(),
+                            FrameColumnStore(list_df.assign(vector=[[1, 2], [3], [], [4], [5, 7]])).fingerprint())
+
+    def test_npy_fingerprint(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            save_column_store(self._df, path.join(temp_dir, 'store_1'))
+            save_column_store(self._df, path.join(temp_dir, 'store_2'))
+            save_column_store(self._df.assign(bravo=[1.5, 2.5, 3.5, 4.5, 5.5]), path.join(temp_dir, 'store_3'))
+
+            # stores of the same values have the same fingerprint, wherever they were saved
+            fingerprint = open_column_store(path.join(temp_dir, 'store_1')).fingerprint()
+            self.assertEqual(open_column_store(path.join(temp_dir, 'store_2')).fingerprint(), fingerprint)
+            self.assertNotEqual(open_column_store(path.join(temp_dir, 'store_3')).fingerprint(), fingerprint)
+
+    def test_unknown_format(self) -> None:
+        with self.assertRaises(ValueError):
+            open_column_store('reference.csv')
+
+    @unittest.skipIf(pa is None, 'pyarrow is not installed')
+    def test_arrow_store(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store_path = path.join(temp_dir, 'store.arrow')
+            table = pa.Table.from_pandas(self._df, preserve_index=False)
+            with pa.OSFile(store_path, 'wb') as sink:
+                writer = pa.RecordBatchFileWriter(sink, table.schema)
+                for batch in table.to_batches(chunksize=2):
+                    writer.write_batch(batch)
+                writer.close()
+            store = open_column_store(store_path)
+
+            self.assertEqual(len(store), 5)
+            self.assertListEqual(store.columns, ['d3mIndex', 'alpha col', 'bravo'])
+            self.assertListEqual(list(store.take('alpha col', np.array([4, 0, 3]))), ['golf', 'yankee', 'foxtrot'])
+            self.assertListEqual(list(store.column('d3mIndex')), [0, 1, 2, 3, 4])
+
+    @unittest.skipIf(pa is None, 'pyarrow is not installed')
+    def test_parquet_store(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store_path = path.join(temp_dir, 'store.parquet')
+            pq.write_table(pa.Table.from_pandas(self._df, preserve_index=False), store_path, row_group_size=2)
+            store = open_column_store(store_path)
+
+            self.assertEqual(len(store), 5)
+            self.assertListEqual(list(store.take('bravo', np.array([4, 0, 3]))), [5.5, 1.5, 4.5])
+            self.assertListEqual(list(store.column('d3mIndex')), [0, 1, 2, 3, 4])
+
+            # the file is identified by its size and modification time, so rewriting it changes the fingerprint
+            fingerprint = store.fingerprint()
+            self.assertEqual(open_column_store(store_path).fingerprint(), fingerprint)
+            pq.write_table(pa.Table.from_pandas(self._df.iloc[:4], preserve_index=False), store_path)
+            self.assertNotEqual(open_column_store(store_path).fingerprint(), fingerprint)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,16 +15,22 @@
 """
 
 import unittest
+import os
+import tempfile
 from os import path
 import csv
 import typing
+from unittest import mock
 import pandas as pd
 import numpy as np
 
-from d3m import container
+from d3m import container, exceptions
 from d3m.primitives.data_transformation.fuzzy_join import DistilFuzzyJoin as FuzzyJoin
 from d3m.metadata import base as metadata_base
 
+from fuzzyjoin import blocking
+from fuzzyjoin.column_store import save_column_store
+
 
 class FuzzyJoinPrimitiveTestCase(unittest.TestCase):
 
@@ -114,6 +120,610 @@ class FuzzyJoinPrimitiveTestCase(unittest.TestCase):
         self.assertListEqual(list(result_dataframe['whiskey']), [10.0, 10.0, 10.0, 10.0, 20.0, 20.0])
         self.assertListEqual(list(result_dataframe['charlie']), [100.0, 100.0, 100.0, 100.0, 300.0, 300.0])
 
+    def test_timezone_date_join(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+
+        # the right times given with timezones, which are compared as UTC with the left times that have none
+        right_df = dataframe_2['0']
+        dataframe_2['0'] = right_df.assign(tango=['2019-01-21T10:54:21Z', '2019-01-21T11:59:21+01:00',
+                                                  '2019-01-21T12:55:56+02:00', '2019-01-21T10:57:21Z'])
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        hyperparams = hyperparams_class.defaults().replace(
+            {
+                'left_col': 'sierra',
+                'right_col': 'tango',
+                'accuracy': 0.8,
+            }
+        )
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+        result_dataframe = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value['0']
+
+        # verify the output matches the join against the times without timezones
+        self.assertListEqual(list(result_dataframe['d3mIndex']), [1, 2, 3, 4, 5, 6])
+        self.assertListEqual(list(result_dataframe['charlie']), [100.0, 100.0, 100.0, 100.0, 300.0, 300.0])
+
+    def test_parallel_join(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        hyperparams = hyperparams_class.defaults().replace(
+            {
+                'left_col': 'alpha',
+                'right_col': 'alpha',
+                'accuracy': 0.9,
+                'n_jobs': 2,
+                'chunk_size': 2,
+            }
+        )
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+        result_dataset = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value
+        result_dataframe = result_dataset['0']
+
+        # verify the output matches the serial join
+        self.assertListEqual(list(result_dataframe['d3mIndex']), [1, 2, 3, 4, 5, 7, 8])
+        self.assertListEqual(list(result_dataframe['charlie']),
+                             [100.0, 100.0, 100.0, 200.0, 200.0, 300.0, 300.0])
+
+    def test_saved_join_index(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        with tempfile.TemporaryDirectory() as index_dir:
+            hyperparams = hyperparams_class.defaults().replace(
+                {
+                    'left_col': 'sierra',
+                    'right_col': 'tango',
+                    'accuracy': 0.8,
+                    'index_dir': index_dir,
+                }
+            )
+
+            # second primitive loads the index saved by the first
+            results = []
+            for _ in range(2):
+                fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+                results.append(fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value['0'])
+            self.assertEqual(len(os.listdir(index_dir)), 1)
+
+        for result_dataframe in results:
+            self.assertListEqual(list(result_dataframe['d3mIndex']), [1, 2, 3, 4, 5, 6])
+            self.assertListEqual(list(result_dataframe['charlie']), [100.0, 100.0, 100.0, 100.0, 300.0, 300.0])
+
+    def test_match_cache(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        hyperparams = hyperparams_class.defaults().replace(
+            {
+                'left_col': 'alpha',
+                'right_col': 'alpha',
+                'accuracy': 0.9,
+                'match_cache_size': 100,
+            }
+        )
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+        fuzzy_join.produce(left=dataframe_1, right=dataframe_2)
+        hits = FuzzyJoin.get_match_cache_info().hits
+
+        # every left key without an exact match is served from the cache on the second join
+        result_dataframe = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value['0']
+        self.assertEqual(FuzzyJoin.get_match_cache_info().hits - hits, 5)
+        self.assertListEqual(list(result_dataframe['d3mIndex']), [1, 2, 3, 4, 5, 7, 8])
+        self.assertListEqual(list(result_dataframe['charlie']),
+                             [100.0, 100.0, 100.0, 200.0, 200.0, 300.0, 300.0])
+
+    def test_input_unmodified(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+        left_df = dataframe_1['0'].copy()
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        hyperparams = hyperparams_class.defaults().replace(
+            {
+                'left_col': 'whiskey',
+                'right_col': 'xray',
+                'accuracy': 0.9,
+            }
+        )
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+        result_dataset = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value
+        result_dataframe = result_dataset['0']
+
+        # verify the output, and that the input wasn't modified
+        self.assertListEqual(list(result_dataframe), ['d3mIndex', 'alpha_1', 'bravo', 'whiskey', 'sierra',
+                                                      'alpha_2', 'charlie', 'tango'])
+        self.assertListEqual(list(result_dataframe['d3mIndex']), [1, 2, 3, 4])
+        self.assertListEqual(list(result_dataframe['alpha_2']), ['hotel', 'hotel', 'hotel', 'hotel'])
+        self.assertTrue(dataframe_1['0'].equals(left_df))
+
+    def test_chunked_join(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        hyperparams = hyperparams_class.defaults()
+        for replaced in ({'left_col': 'alpha', 'right_col': 'alpha', 'accuracy': 0.9},
+                         {'left_col': 'alpha', 'right_col': 'alpha', 'accuracy': 0.9, 'categorical_keys': True},
+                         {'left_col': 'whiskey', 'right_col': 'xray', 'accuracy': 0.9},
+                         {'left_col': 'sierra', 'right_col': 'tango', 'accuracy': 0.5},
+                         {'left_col': ['alpha', 'sierra'], 'right_col': ['alpha', 'tango'], 'accuracy': [0.8, 0.5]}):
+            fuzzy_join = FuzzyJoin(hyperparams=hyperparams.replace(replaced))
+            expected_dataframe = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value['0']
+
+            # verify the output is the same whatever the number of rows joined at a time
+            for row_chunk_size in (1, 2, 3, 100):
+                fuzzy_join = FuzzyJoin(hyperparams=hyperparams.replace(replaced).replace(
+                    {'row_chunk_size': row_chunk_size}))
+                result_dataframe = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value['0']
+                self.assertTrue(result_dataframe.equals(expected_dataframe))
+
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams.replace({'row_chunk_size': -1}))
+        with self.assertRaises(exceptions.InvalidArgumentValueError):
+            fuzzy_join.produce(left=dataframe_1, right=dataframe_2)
+
+    def test_chunked_join_memory(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        hyperparams = hyperparams_class.defaults().replace(
+            {
+                'left_col': 'alpha',
+                'right_col': 'alpha',
+                'accuracy': 0.9,
+                'row_chunk_size': 2,
+            }
+        )
+        joined_rows: typing.List[int] = []
+
+        def record_positions(*args: typing.Any) -> typing.Tuple[np.ndarray, np.ndarray]:
+            positions = blocking.join_positions(*args)
+            joined_rows.append(len(positions[0]))
+            return positions
+
+        with mock.patch('fuzzyjoin.fuzzy_join.join_positions', record_positions):
+            fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+            result_dataframe = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value['0']
+
+        # verify the 7 joined rows were found 2 left rows at a time, each of which joins a single right row, so no
+        # chunk held the positions of more than 2 of them
+        self.assertListEqual(joined_rows, [2, 2, 2, 1])
+        self.assertEqual(len(result_dataframe), 7)
+
+    def test_exact_join(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        hyperparams = hyperparams_class.defaults().replace(
+            {
+                'left_col': 'alpha',
+                'right_col': 'alpha',
+                'accuracy': 1.0,
+                'normalize_exact_matches': True,
+            }
+        )
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+        result_dataset = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value
+        result_dataframe = result_dataset['0']
+
+        # verify only the keys equal to a right key, ignoring case, were joined
+        self.assertListEqual(list(result_dataframe['d3mIndex']), [1, 4, 5, 8])
+        self.assertListEqual(list(result_dataframe['alpha']), ['yankee', 'Hotel', 'hotel', 'foxtrot'])
+        self.assertListEqual(list(result_dataframe['charlie']), [100.0, 200.0, 200.0, 300.0])
+
+    def test_exact_join_right_variants(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+
+        # a right key that only differs from another in case and whitespace
+        right_df = dataframe_2['0']
+        dataframe_2['0'] = right_df.assign(alpha=['yankee', 'hotel', 'foxtrot', 'HOTEL '])
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        hyperparams = hyperparams_class.defaults().replace(
+            {
+                'left_col': 'alpha',
+                'right_col': 'alpha',
+                'accuracy': 1.0,
+                'normalize_exact_matches': True,
+            }
+        )
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+        result_dataframe = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value['0']
+
+        # verify the left keys join both right keys that are equal to them ignoring case
+        self.assertListEqual(list(result_dataframe['d3mIndex']), [1, 4, 4, 5, 5, 8])
+        self.assertListEqual(list(result_dataframe['charlie']), [100.0, 200.0, 400.0, 200.0, 400.0, 300.0])
+
+    def test_blank_keys(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+
+        # blank and punctuation only keys, which have nothing to score once normalized
+        left_df = dataframe_1['0']
+        dataframe_1['0'] = left_df.assign(alpha=['yankee', 'yankeee', '', 'Hotel', 'hotel', '', '-', 'foxtrot'])
+        right_df = dataframe_2['0']
+        dataframe_2['0'] = right_df.assign(alpha=['yankee', 'hotel', '', '-'])
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        hyperparams = hyperparams_class.defaults().replace(
+            {
+                'left_col': 'alpha',
+                'right_col': 'alpha',
+                'accuracy': 0.9,
+            }
+        )
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+        result_dataframe = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value['0']
+
+        # verify the blank keys aren't joined, even to equal keys
+        self.assertListEqual(list(result_dataframe['d3mIndex']), [1, 2, 4, 5])
+        self.assertListEqual(list(result_dataframe['charlie']), [100.0, 100.0, 200.0, 200.0])
+
+        hyperparams = hyperparams.replace({'accuracy': 1.0, 'normalize_exact_matches': True})
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+        result_dataframe = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value['0']
+        self.assertListEqual(list(result_dataframe['d3mIndex']), [1, 4, 5])
+
+    def test_latin1_punctuation(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+
+        # right keys with latin-1 punctuation, which fuzzywuzzy drops from choices rather than splitting words on
+        right_df = dataframe_2['0']
+        dataframe_2['0'] = right_df.assign(alpha=['yank\xa0ee', 'ho\xb7tel', 'foxtrot', 'golf'])
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        hyperparams = hyperparams_class.defaults().replace(
+            {
+                'left_col': 'alpha',
+                'right_col': 'alpha',
+                'accuracy': 0.99,
+            }
+        )
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+        result_dataframe = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value['0']
+
+        # verify the keys join as they would with fuzzywuzzy's extractOne
+        self.assertListEqual(list(result_dataframe['d3mIndex']), [1, 4, 5, 8])
+        self.assertListEqual(list(result_dataframe['charlie']), [100.0, 200.0, 200.0, 300.0])
+
+    def test_string_normalization(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        hyperparams = hyperparams_class.defaults().replace(
+            {
+                'left_col': 'alpha',
+                'right_col': 'alpha',
+                'accuracy': 0.9,
+                'string_normalization': 'token_sort',
+            }
+        )
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+        result_dataset = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value
+        result_dataframe = result_dataset['0']
+
+        # verify the output
+        self.assertListEqual(list(result_dataframe['d3mIndex']), [1, 2, 3, 4, 5, 7, 8])
+        self.assertListEqual(list(result_dataframe['charlie']),
+                             [100.0, 100.0, 100.0, 200.0, 200.0, 300.0, 300.0])
+
+        hyperparams = hyperparams.replace({'string_normalization': 'soundex'})
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+        with self.assertRaises(exceptions.InvalidArgumentValueError):
+            fuzzy_join.produce(left=dataframe_1, right=dataframe_2)
+
+    def test_tfidf_matcher(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        hyperparams = hyperparams_class.defaults().replace(
+            {
+                'left_col': 'alpha',
+                'right_col': 'alpha',
+                'accuracy': 0.7,
+                'string_matcher': 'tfidf',
+                'tfidf_block_size': 2,
+            }
+        )
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+        result_dataset = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value
+        result_dataframe = result_dataset['0']
+
+        # verify the output
+        self.assertListEqual(list(result_dataframe['d3mIndex']), [1, 2, 4, 5, 7, 8])
+        self.assertListEqual(list(result_dataframe['charlie']),
+                             [100.0, 100.0, 200.0, 200.0, 300.0, 300.0])
+
+        hyperparams = hyperparams.replace({'string_matcher': 'jaccard'})
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+        with self.assertRaises(exceptions.InvalidArgumentValueError):
+            fuzzy_join.produce(left=dataframe_1, right=dataframe_2)
+
+    def test_multi_col_join(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        hyperparams = hyperparams_class.defaults().replace(
+            {
+                'left_col': ['alpha', 'sierra'],
+                'right_col': ['alpha', 'tango'],
+                'accuracy': [0.8, 0.5],
+            }
+        )
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+        result_dataset = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value
+        result_dataframe = result_dataset['0']
+
+        # verify the output
+        self.assertListEqual(list(result_dataframe['d3mIndex']), [1, 2, 3])
+        self.assertListEqual(list(result_dataframe['charlie']), [100.0, 100.0, 100.0])
+        self.assertNotIn('tango', result_dataframe)
+
+        hyperparams = hyperparams.replace({'left_col': ['alpha', 'whiskey'], 'right_col': ['alpha', 'xray'],
+                                           'accuracy': 0.9})
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+        result_dataset = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value
+        result_dataframe = result_dataset['0']
+        self.assertListEqual(list(result_dataframe['d3mIndex']), [4])
+        self.assertListEqual(list(result_dataframe['charlie']), [200.0])
+
+        hyperparams = hyperparams.replace({'accuracy': [0.9, 0.9, 0.9]})
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+        with self.assertRaises(exceptions.InvalidArgumentValueError):
+            fuzzy_join.produce(left=dataframe_1, right=dataframe_2)
+
+    def test_output_metadata(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        hyperparams = hyperparams_class.defaults().replace(
+            {
+                'left_col': 'whiskey',
+                'right_col': 'xray',
+                'accuracy': 0.9,
+            }
+        )
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+        result_dataset = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value
+        result_dataframe = result_dataset['0']
+
+        # the joined resource's metadata is taken from the left and right cols, and matches its shape
+        metadata = result_dataset.metadata
+        self.assertEqual(metadata.query(('0',))['dimension']['length'], result_dataframe.shape[0])
+        self.assertEqual(metadata.query(('0', metadata_base.ALL_ELEMENTS))['dimension']['length'],
+                         result_dataframe.shape[1])
+        for col_idx, col_name in enumerate(result_dataframe.columns):
+            self.assertEqual(metadata.query(('0', metadata_base.ALL_ELEMENTS, col_idx))['name'], col_name)
+        self.assertIn('http://schema.org/Float',
+                      metadata.query(('0', metadata_base.ALL_ELEMENTS, 6))['semantic_types'])
+        self.assertIn('http://schema.org/DateTime',
+                      metadata.query(('0', metadata_base.ALL_ELEMENTS, 7))['semantic_types'])
+
+    def test_categorical_keys(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        hyperparams = hyperparams_class.defaults().replace(
+            {
+                'left_col': 'alpha',
+                'right_col': 'alpha',
+                'accuracy': 0.9,
+                'categorical_keys': True,
+            }
+        )
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+        result_dataset = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value
+        result_dataframe = result_dataset['0']
+
+        # the join col is a categorical of the left keys, whose metadata keeps the type of the keys
+        self.assertEqual(str(result_dataframe['alpha'].dtype), 'category')
+        self.assertListEqual(list(result_dataframe['d3mIndex']), [1, 2, 3, 4, 5, 7, 8])
+        self.assertListEqual(list(result_dataframe['alpha']),
+                             ['yankee', 'yankeee', 'yank', 'Hotel', 'hotel', 'foxtrot aa', 'foxtrot'])
+        self.assertEqual(result_dataset.metadata.query(('0', metadata_base.ALL_ELEMENTS, 1))['structural_type'],
+                         str)
+
+    def test_point_join(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        hyperparams = hyperparams_class.defaults().replace(
+            {
+                'left_col': 'whiskey',
+                'right_col': 'xray',
+                'accuracy': 0.9,
+                'point_join': True,
+            }
+        )
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+        result_dataframe = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value['0']
+
+        # verify points were joined within a tenth of the smaller of the left and right ranges
+        self.assertListEqual(list(result_dataframe['d3mIndex']), [1, 2, 3, 4])
+        self.assertListEqual(list(result_dataframe['charlie']), [200.0, 200.0, 200.0, 200.0])
+
+        # points need numeric cols
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams.replace({'left_col': ['whiskey', 'alpha'],
+                                                                'right_col': ['xray', 'alpha']}))
+        with self.assertRaises(exceptions.InvalidArgumentValueError):
+            fuzzy_join.produce(left=dataframe_1, right=dataframe_2)
+
+    def test_right_store(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store_path = path.join(temp_dir, 'right')
+            save_column_store(dataframe_2['0'], store_path)
+            hyperparams = hyperparams_class.defaults().replace(
+                {
+                    'left_col': 'alpha',
+                    'right_col': 'alpha',
+                    'accuracy': 0.9,
+                    'right_store': store_path,
+                }
+            )
+            fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+            result_dataframe = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value['0']
+
+        # verify the output matches the join against the right dataset's table
+        self.assertListEqual(list(result_dataframe), ['d3mIndex', 'alpha', 'bravo', 'whiskey',
+                                                      'sierra', 'charlie', 'xray', 'tango'])
+        self.assertListEqual(list(result_dataframe['d3mIndex']), [1, 2, 3, 4, 5, 7, 8])
+        self.assertListEqual(list(result_dataframe['charlie']),
+                             [100.0, 100.0, 100.0, 200.0, 200.0, 300.0, 300.0])
+
+        hyperparams = hyperparams.replace({'right_store': path.join(self._dataset_path_2, 'missing.parquet')})
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+        with self.assertRaises(exceptions.InvalidArgumentValueError):
+            fuzzy_join.produce(left=dataframe_1, right=dataframe_2)
+
+    def test_budget(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        hyperparams = hyperparams_class.defaults().replace(
+            {
+                'left_col': 'alpha',
+                'right_col': 'alpha',
+                'accuracy': 0.9,
+                'chunk_size': 1,
+            }
+        )
+        progress: typing.List[typing.Tuple[int, int]] = []
+
+        def progress_hook(budget: typing.Any) -> None:
+            progress.append((budget.iterations_done, budget.keys_done))
+
+        FuzzyJoin.add_progress_hook(hook=progress_hook)
+        try:
+            # a single iteration fuzzy matches the first of the keys that aren't exact matches
+            fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+            result = fuzzy_join.produce(left=dataframe_1, right=dataframe_2, iterations=1)
+        finally:
+            FuzzyJoin.remove_progress_hook(hook=progress_hook)
+        self.assertFalse(result.has_finished)
+        self.assertEqual(result.iterations_done, 1)
+        self.assertListEqual(list(result.value['0']['d3mIndex']), [1, 2, 5, 8])
+        self.assertListEqual(progress, [(1, 1)])
+
+        # running out of time raises, unless partial results are allowed
+        with self.assertRaises(TimeoutError):
+            fuzzy_join.produce(left=dataframe_1, right=dataframe_2, timeout=0.0)
+
+        fuzzy_join = FuzzyJoin(hyperparams=hyperparams.replace({'timeout_action': 'partial'}))
+        result = fuzzy_join.produce(left=dataframe_1, right=dataframe_2, timeout=0.0)
+        self.assertFalse(result.has_finished)
+        self.assertListEqual(list(result.value['0']['d3mIndex']), [1, 5, 8])
+
+        result = fuzzy_join.produce(left=dataframe_1, right=dataframe_2, timeout=60.0)
+        self.assertTrue(result.has_finished)
+        self.assertListEqual(list(result.value['0']['d3mIndex']), [1, 2, 3, 4, 5, 7, 8])
+
+    def test_incremental_join(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+        left_df = dataframe_1['0']
+        right_df = dataframe_2['0']
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        with tempfile.TemporaryDirectory() as temp_dir:
+            hyperparams = hyperparams_class.defaults().replace(
+                {
+                    'left_col': 'alpha',
+                    'right_col': 'alpha',
+                    'accuracy': 0.9,
+                    'incremental': True,
+                    'state_dir': path.join(temp_dir, 'state'),
+                }
+            )
+            dataframe_1['0'] = left_df.iloc[:5]
+            fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+            result_dataframe = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value['0']
+            self.assertListEqual(list(result_dataframe['d3mIndex']), [1, 2, 3, 4, 5])
+
+            # a second primitive continues from the saved state, and only joins the appended rows
+            dataframe_1['0'] = left_df
+            fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+            result_dataframe = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value['0']
+            self.assertEqual(fuzzy_join.get_join_state().start, 5)
+            self.assertListEqual(list(result_dataframe['d3mIndex']), [7, 8])
+            self.assertListEqual(list(result_dataframe['charlie']), [300.0, 300.0])
+
+            # every row is joined again once the right side changes
+            dataframe_2['0'] = right_df.assign(charlie=right_df['charlie'] * 2)
+            result_dataframe = fuzzy_join.produce(left=dataframe_1, right=dataframe_2).value['0']
+            self.assertEqual(fuzzy_join.get_join_state().start, 0)
+            self.assertListEqual(list(result_dataframe['d3mIndex']), [1, 2, 3, 4, 5, 7, 8])
+            self.assertListEqual(list(result_dataframe['charlie']),
+                                 [200.0, 200.0, 200.0, 400.0, 400.0, 600.0, 600.0])
+
+    def test_profile_hook(self) -> None:
+        dataframe_1 = self._load_data(self._dataset_path_1)
+        dataframe_2 = self._load_data(self._dataset_path_2)
+
+        hyperparams_class = \
+            FuzzyJoin.metadata.query()['primitive_code']['class_type_arguments']['Hyperparams']
+        hyperparams = hyperparams_class.defaults().replace(
+            {
+                'left_col': 'alpha',
+                'right_col': 'alpha',
+                'accuracy': 0.9,
+            }
+        )
+        profiles: typing.List[typing.Any] = []
+        FuzzyJoin.add_profile_hook(hook=profiles.append)
+        try:
+            fuzzy_join = FuzzyJoin(hyperparams=hyperparams)
+            fuzzy_join.produce(left=dataframe_1, right=dataframe_2)
+        finally:
+            FuzzyJoin.remove_profile_hook(hook=profiles.append)
+
+        # verify each phase was timed and the keys and rows were counted
+        self.assertEqual(len(profiles), 1)
+        self.assertListEqual(list(profiles[0].timings),
+                             ['extract', 'semantic_type', 'join_index', 'match', 'join', 'sort', 'dataset'])
+        self.assertEqual(profiles[0].counters['left_keys'], 8)
+        self.assertEqual(profiles[0].counters['right_keys'], 4)
+        self.assertEqual(profiles[0].counters['matches'], 7)
+        self.assertEqual(profiles[0].counters['rows'], 7)
+
     def _load_data(cls, dataset_path: str) -> container.DataFrame:
         dataset_doc_path = path.join(dataset_path, 'datasetDoc.json')
 
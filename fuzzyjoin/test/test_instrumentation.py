@@ -0,0 +1,50 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import unittest
+
+from fuzzyjoin.instrumentation import JoinProfile
+
+
+class JoinProfileTestCase(unittest.TestCase):
+
+    def test_profile(self) -> None:
+        profile = JoinProfile()
+        with profile.phase('match'):
+            pass
+        with profile.phase('match'):
+            pass
+        with profile.phase('join'):
+            pass
+        profile.count('rows', 3)
+        profile.count('rows', 2)
+
+        self.assertListEqual(list(profile.timings), ['match', 'join'])
+        self.assertTrue(all(timing >= 0.0 for timing in profile.timings.values()))
+        self.assertDictEqual(dict(profile.counters), {'rows': 5})
+
+    def test_disabled_profile(self) -> None:
+        profile = JoinProfile(enabled=False)
+        with profile.phase('match'):
+            pass
+        profile.count('rows', 3)
+
+        self.assertDictEqual(dict(profile.timings), {})
+        self.assertDictEqual(dict(profile.counters), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
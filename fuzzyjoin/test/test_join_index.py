@@ -0,0 +1,114 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import unittest
+import tempfile
+from os import path
+
+import numpy as np
+import pandas as pd
+
+from fuzzyjoin.join_index import JoinIndex, fingerprint
+from fuzzyjoin.qgram_index import QGramIndex
+from fuzzyjoin.sorted_index import SortedIndex
+from fuzzyjoin.tfidf_index import TfidfIndex
+
+
+class JoinIndexTestCase(unittest.TestCase):
+
+    def test_string_index_round_trip(self) -> None:
+        codes, keys = pd.factorize(pd.Series(['yankee', 'hotel', 'foxtrot', 'hotel', 'golf']))
+        join_index = JoinIndex('abc', codes, keys, QGramIndex(keys, 90.0))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            index_path = path.join(temp_dir, 'index')
+            join_index.save(index_path)
+            loaded = JoinIndex.load(index_path)
+
+            self.assertEqual(loaded.fingerprint, 'abc')
+            self.assertIsInstance(loaded.codes, np.memmap)
+            self.assertListEqual(list(loaded.codes), list(codes))
+            self.assertListEqual(list(loaded.keys), list(keys))
+
+            # string keys and choices are saved as fixed width strings, so they're mapped rather than unpickled
+            self.assertIsInstance(loaded.keys, np.memmap)
+            self.assertIsInstance(loaded.key_index.choices, np.memmap)
+            for key in ('yankeee', 'Hotel', 'foxtrot aa', 'zulu'):
+                self.assertListEqual(list(loaded.key_index.candidates(key)),
+                                     list(join_index.key_index.candidates(key)))
+
+    def test_sorted_index_round_trip(self) -> None:
+        codes, keys = pd.factorize(pd.Series([11.0, 9.5, 17.0, 23.1, 9.5]))
+        join_index = JoinIndex('abc', codes, keys, SortedIndex(keys))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            index_path = path.join(temp_dir, 'index')
+            join_index.save(index_path)
+            loaded = JoinIndex.load(index_path, mmap=False)
+
+            values = np.array([10.0, 20.0])
+            self.assertListEqual(list(loaded.key_index.nearest(values, 1.0)),
+                                 list(join_index.key_index.nearest(values, 1.0)))
+
+    def test_exact_index_round_trip(self) -> None:
+        codes, keys = pd.factorize(pd.Series(['yankee', 'hotel', 'Hotel']))
+        join_index = JoinIndex('abc', codes, keys, None)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            index_path = path.join(temp_dir, 'index')
+            join_index.save(index_path)
+            loaded = JoinIndex.load(index_path)
+
+            self.assertIsNone(loaded.key_index)
+            self.assertListEqual(list(loaded.exact_matches(np.array(['Hotel', 'golf'], dtype=object))), [2, -1])
+
+    def test_exact_matches(self) -> None:
+        codes, keys = pd.factorize(pd.Series(['yankee', 'Hotel', 'hotel', 'foxtrot  aa']))
+        join_index = JoinIndex('abc', codes, keys, None)
+
+        values = np.array(['hotel', ' HOTEL', 'foxtrot aa', 'yankee', None, 'golf'], dtype=object)
+        self.assertListEqual(list(join_index.exact_matches(values)), [2, -1, -1, 0, -1, -1])
+        self.assertListEqual(list(join_index.exact_matches(values, normalize=True)), [1, 1, 3, 0, -1, -1])
+
+        codes, keys = pd.factorize(pd.Series([11.0, 9.5, 17.0]))
+        join_index = JoinIndex('abc', codes, keys, None)
+        self.assertListEqual(list(join_index.exact_matches(np.array([9.5, 9.6, np.nan]))), [1, -1, -1])
+
+    def test_subset(self) -> None:
+        codes, keys = pd.factorize(pd.Series(['yankee', 'hotel', 'foxtrot', 'golf']))
+        join_index = JoinIndex('abc', codes, keys, QGramIndex(keys, 80.0))
+        subset = join_index.subset(np.array([3, 1]))
+
+        self.assertListEqual(list(subset.keys), ['golf', 'hotel'])
+        self.assertEqual(len(subset.codes), 0)
+        self.assertIsNone(subset.fingerprint)
+        self.assertListEqual(list(subset.exact_matches(np.array(['hotel', 'yankee'], dtype=object))), [1, -1])
+        self.assertListEqual(list(subset.key_index.candidates('hotels')), [1])
+
+        join_index = JoinIndex('abc', codes, keys, TfidfIndex(keys, 0.5))
+        positions, _ = join_index.subset(np.array([3, 1])).key_index.best_matches(
+            np.array(['hotels', 'yankee'], dtype=object), 10)
+        self.assertListEqual(list(positions), [1, -1])
+
+    def test_fingerprint(self) -> None:
+        values = pd.Series(['yankee', 'hotel'])
+        self.assertEqual(fingerprint(values, 0.9), fingerprint(values.copy(), 0.9))
+        self.assertNotEqual(fingerprint(values, 0.9), fingerprint(values, 0.8))
+        self.assertNotEqual(fingerprint(values, 0.9), fingerprint(pd.Series(['yankee', 'hotels']), 0.9))
+
+
+if __name__ == '__main__':
+    unittest.main()
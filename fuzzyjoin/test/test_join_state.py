@@ -0,0 +1,77 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import unittest
+import tempfile
+from os import path
+
+import pandas as pd
+
+from fuzzyjoin.join_state import JoinState, advance_state
+
+
+class JoinStateTestCase(unittest.TestCase):
+
+    def test_appended_rows(self) -> None:
+        left_keys = pd.DataFrame({'alpha': ['yankee', 'hotel', 'foxtrot']})
+        state = advance_state(None, 'abc', left_keys.iloc[:2])
+        self.assertEqual((state.start, state.rows), (0, 2))
+        state.match_cache.put(('def', 'hotel'), 1)
+
+        # only the appended row needs joining, and the string matches are kept
+        appended = advance_state(state, 'abc', left_keys)
+        self.assertEqual((appended.start, appended.rows), (2, 3))
+        self.assertEqual(appended.match_cache.lookup(('def', 'hotel')), (True, 1))
+
+        # nothing is appended by joining the same rows again
+        self.assertEqual(advance_state(appended, 'abc', left_keys).start, 3)
+
+    def test_full_join(self) -> None:
+        left_keys = pd.DataFrame({'alpha': ['yankee', 'hotel', 'foxtrot']})
+        state = advance_state(None, 'abc', left_keys.iloc[:2])
+        state.match_cache.put(('def', 'hotel'), 1)
+
+        # every row is joined again when the joined rows are modified or removed, or the join isn't incremental
+        modified = pd.DataFrame({'alpha': ['yankee', 'golf', 'foxtrot']})
+        self.assertEqual(advance_state(state, 'abc', modified).start, 0)
+        self.assertEqual(advance_state(state, 'abc', left_keys.iloc[:1]).start, 0)
+        self.assertEqual(advance_state(state, 'abc', left_keys, False).start, 0)
+
+        # and when the right side changes, which also drops the string matches
+        changed = advance_state(state, 'ghi', left_keys)
+        self.assertEqual((changed.start, changed.rows), (0, 3))
+        self.assertEqual(changed.match_cache.lookup(('def', 'hotel')), (False, None))
+
+    def test_round_trip(self) -> None:
+        state = advance_state(None, 'abc', pd.DataFrame({'alpha': ['yankee', 'hotel']}))
+        state.match_cache.put(('def', 'hotel'), 1)
+        state.match_cache.put(('def', 'golf'), -1)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_path = path.join(temp_dir, 'state')
+            JoinState('ghi', 1, 'jkl', state.match_cache).save(state_path)
+
+            # saving again replaces the earlier state
+            state.save(state_path)
+            loaded = JoinState.load(state_path)
+
+        self.assertEqual((loaded.right_fingerprint, loaded.rows, loaded.left_fingerprint, loaded.start),
+                         (state.right_fingerprint, state.rows, state.left_fingerprint, state.start))
+        self.assertListEqual(loaded.match_cache.items(), state.match_cache.items())
+
+
+if __name__ == '__main__':
+    unittest.main()
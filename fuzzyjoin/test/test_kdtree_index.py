@@ -0,0 +1,62 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import unittest
+import tempfile
+from os import path
+
+import numpy as np
+
+from fuzzyjoin.kdtree_index import KDTreeIndex
+
+
+class KDTreeIndexTestCase(unittest.TestCase):
+
+    _choices = np.array([[0.0, 0.0], [1.0, 1.0], [np.nan, 2.0], [3.0, 4.0]])
+
+    def test_nearest(self) -> None:
+        index = KDTreeIndex(self._choices)
+        values = np.array([[0.9, 1.1], [0.4, 0.4], [5.0, 5.0], [3.0, 4.5]])
+        self.assertListEqual(list(index.nearest(values, 0.6)), [1, 0, -1, 3])
+
+    def test_exact(self) -> None:
+        index = KDTreeIndex(self._choices)
+        values = np.array([[1.0, 1.0], [0.5, 0.5], [3.0, 4.0]])
+        self.assertListEqual(list(index.nearest(values, 0.0)), [1, -1, 3])
+
+    def test_nulls(self) -> None:
+        index = KDTreeIndex(self._choices)
+        self.assertListEqual(list(index.nearest(np.array([[np.nan, 2.0], [0.0, np.nan]]), 10.0)), [-1, -1])
+        self.assertListEqual(list(KDTreeIndex(np.empty((0, 2))).nearest(np.array([[1.0, 1.0]]), 1.0)), [-1])
+        self.assertEqual(len(index.nearest(np.empty((0, 2)), 1.0)), 0)
+
+    def test_subset(self) -> None:
+        subset = KDTreeIndex(self._choices).subset(np.array([3, 0]))
+        self.assertListEqual(list(subset.nearest(np.array([[3.0, 4.0], [1.0, 1.0]]), 1.5)), [0, 1])
+
+    def test_round_trip(self) -> None:
+        index = KDTreeIndex(self._choices)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            index_path = path.join(temp_dir, 'index')
+            index.save(index_path)
+            loaded = KDTreeIndex.load(index_path)
+
+            values = np.array([[0.9, 1.1], [2.5, 3.5]])
+            self.assertListEqual(list(loaded.nearest(values, 1.0)), list(index.nearest(values, 1.0)))
+
+
+if __name__ == '__main__':
+    unittest.main()
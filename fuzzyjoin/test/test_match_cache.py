@@ -0,0 +1,49 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import unittest
+
+from fuzzyjoin.match_cache import MatchCache
+
+
+class MatchCacheTestCase(unittest.TestCase):
+
+    def test_lru_eviction(self) -> None:
+        cache = MatchCache(2)
+        cache.put('a', 'alpha')
+        cache.put('b', None)
+        self.assertEqual(cache.lookup('a'), (True, 'alpha'))
+
+        # 'b' is now the least recently used entry
+        cache.put('c', 'charlie')
+        self.assertEqual(cache.lookup('b'), (False, None))
+        self.assertEqual(cache.lookup('c'), (True, 'charlie'))
+
+        cache.resize(1)
+        self.assertEqual(cache.lookup('a'), (False, None))
+        self.assertEqual(tuple(cache.cache_info()), (2, 2, 1, 1))
+
+    def test_cached_none(self) -> None:
+        cache = MatchCache(2)
+        cache.put('a', None)
+        self.assertEqual(cache.lookup('a'), (True, None))
+
+        cache.clear()
+        self.assertEqual(tuple(cache.cache_info()), (0, 0, 2, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import unittest
+
+from fuzzyjoin.normalization import normalize_keys, self_matching
+
+
+class NormalizationTestCase(unittest.TestCase):
+
+    _KEYS = ['  Foxtrot-AA ', 'Café  Ünter', 12]
+
+    def test_default(self) -> None:
+        self.assertListEqual(list(normalize_keys(self._KEYS, 'default')), ['foxtrot aa', 'caf  nter', '12'])
+
+    def test_default_choices(self) -> None:
+        # WRatio drops non-ascii characters from choices before punctuation, so latin-1 punctuation joins words
+        keys = ['Cafe\xa0Bar', 'Rock\xb7n\xb7Roll', '  Foxtrot-AA ']
+        self.assertListEqual(list(normalize_keys(keys, 'default')), ['cafe bar', 'rock n roll', 'foxtrot aa'])
+        self.assertListEqual(list(normalize_keys(keys, 'default', True)), ['cafebar', 'rocknroll', 'foxtrot aa'])
+        self.assertListEqual(list(self_matching(keys, 'default')), [False, False, True])
+        self.assertListEqual(list(self_matching(keys, 'casefold')), [True, True, True])
+
+    def test_casefold(self) -> None:
+        self.assertListEqual(list(normalize_keys(self._KEYS, 'casefold')), ['foxtrot aa', 'café ünter', '12'])
+
+    def test_unicode(self) -> None:
+        self.assertListEqual(list(normalize_keys(self._KEYS, 'unicode')), ['foxtrot aa', 'cafe  unter', '12'])
+
+    def test_token_sort(self) -> None:
+        self.assertListEqual(list(normalize_keys(['AA foxtrot', 'foxtrot aa'], 'token_sort')),
+                             ['aa foxtrot', 'aa foxtrot'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import unittest
+
+import numpy as np
+
+from fuzzyjoin.budget import JoinBudget
+from fuzzyjoin.parallel import map_chunks
+from fuzzyjoin.sorted_index import SortedIndex
+
+
+def _nearest(index: SortedIndex, keys: np.ndarray) -> np.ndarray:
+    return index.nearest(keys, 0.5)
+
+
+class MapChunksTestCase(unittest.TestCase):
+
+    def test_parallel_matches_serial(self) -> None:
+        rng = np.random.RandomState(0)
+        index = SortedIndex(np.unique(rng.randint(0, 1000, 500)).astype(float))
+        keys = rng.uniform(0, 1000, 1000)
+
+        serial = map_chunks(_nearest, index, keys, 1, 100)
+        parallel = map_chunks(_nearest, index, keys, 3, 64)
+        self.assertListEqual(list(parallel), list(serial))
+
+    def test_small_input_runs_serially(self) -> None:
+        index = SortedIndex(np.array([1.0, 2.0]))
+        self.assertListEqual(list(map_chunks(_nearest, index, np.array([1.2, 5.0]), 4, 100)), [0, -1])
+
+    def test_budget_leaves_remaining_keys_unmatched(self) -> None:
+        index = SortedIndex(np.array([1.0, 2.0, 3.0]))
+        keys = np.array([1.1, 2.1, 3.1, 1.2, 2.2])
+
+        for n_jobs in (1, 2):
+            budget = JoinBudget(iterations=2)
+            self.assertListEqual(list(map_chunks(_nearest, index, keys, n_jobs, 2, budget)), [0, 1, 2, 0, -1])
+            self.assertEqual(budget.iterations_done, 2)
+            self.assertTrue(budget.exhausted)
+
+        budget = JoinBudget(timeout=0.0, partial=True)
+        self.assertListEqual(list(map_chunks(_nearest, index, keys, 1, 2, budget, -2)), [-2] * 5)
+        with self.assertRaises(TimeoutError):
+            map_chunks(_nearest, index, keys, 2, 2, JoinBudget(timeout=0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
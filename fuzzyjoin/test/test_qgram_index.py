@@ -0,0 +1,95 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import unittest
+import random
+import typing
+
+import numpy as np
+from fuzzywuzzy import process
+
+from fuzzyjoin.normalization import normalize_keys
+from fuzzyjoin.qgram_index import QGramIndex
+
+
+class QGramIndexTestCase(unittest.TestCase):
+
+    _ALPHABET = 'abcdef gh'
+
+    def test_matches_exhaustive_search(self) -> None:
+        rng = random.Random(42)
+        right_keys = np.array(list(dict.fromkeys(self._random_key(rng) for _ in range(80))), dtype=object)
+        left_keys = [self._typo(rng, rng.choice(right_keys)) for _ in range(40)] + \
+                    [self._random_key(rng) for _ in range(10)]
+
+        # the default normalization is the processing extractOne applies, to its choices and to the query
+        for accuracy in (0.5, 0.8, 0.9, 0.95, 0.96, 0.99, 1.0):
+            index = QGramIndex(normalize_keys(right_keys, 'default', True), accuracy * 100)
+            for left_key in left_keys:
+                candidates = right_keys[index.candidates(normalize_keys([left_key], 'default')[0])]
+                self.assertEqual(self._best(left_key, candidates, accuracy * 100),
+                                 self._best(left_key, right_keys, accuracy * 100))
+
+    def test_first_equal(self) -> None:
+        index = QGramIndex(np.array(['hotel', 'golf', 'hotel', 'golf', 'yankee'], dtype=object), 90.0)
+        self.assertListEqual(list(index.first_equal(np.array([2, 3, 4, 0]))), [0, 1, 4, 0])
+
+    def test_subset(self) -> None:
+        rng = random.Random(7)
+        right_keys = np.array(list(dict.fromkeys(self._random_key(rng) for _ in range(80))), dtype=object)
+        left_keys = normalize_keys([self._typo(rng, rng.choice(right_keys)) for _ in range(20)], 'default')
+
+        # a subset, and a subset of that, find the same candidates as an index built over their choices
+        for accuracy in (0.8, 0.99):
+            index = QGramIndex(normalize_keys(right_keys, 'default', True), accuracy * 100)
+            positions = np.array(rng.sample(range(len(right_keys)), 30))
+            for subset in (index.subset(positions), index.subset(positions).subset(np.arange(29, -1, -2))):
+                rebuilt = QGramIndex(subset.choices, accuracy * 100)
+                self.assertListEqual(list(subset.choices), list(np.asarray(rebuilt.choices)))
+                for left_key in left_keys:
+                    self.assertListEqual(list(subset.candidates(left_key)), list(rebuilt.candidates(left_key)))
+
+    def test_high_accuracy_prunes(self) -> None:
+        right_keys = np.array(['yankee', 'hotel', 'foxtrot', 'golf'], dtype=object)
+        index = QGramIndex(right_keys, 99.0)
+        self.assertListEqual(list(index.candidates('yankeee')), [])
+        self.assertListEqual(list(index.candidates('hotel')), [1])
+
+    def test_shared_token_kept(self) -> None:
+        right_keys = np.array(['yankee', 'hotel', 'foxtrot', 'golf'], dtype=object)
+        index = QGramIndex(right_keys, 90.0)
+        self.assertIn(2, index.candidates('foxtrot aa'))
+
+    @classmethod
+    def _best(cls, key: str, choices: typing.Sequence[str], min_score: float) -> typing.Optional[str]:
+        best = process.extractOne(key, choices) if len(choices) > 0 else None
+        return best[0] if best is not None and best[1] >= min_score else None
+
+    @classmethod
+    def _random_key(cls, rng: random.Random) -> str:
+        return ''.join(rng.choice(cls._ALPHABET + 'AB-\xa0\xb7\xe9') for _ in range(rng.randint(1, 14)))
+
+    @classmethod
+    def _typo(cls, rng: random.Random, key: str) -> str:
+        chars = list(key)
+        for _ in range(rng.randint(0, 2)):
+            pos = rng.randint(0, len(chars) - 1)
+            chars[pos] = rng.choice(cls._ALPHABET)
+        return ''.join(chars)
+
+
+if __name__ == '__main__':
+    unittest.main()
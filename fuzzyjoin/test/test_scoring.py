@@ -0,0 +1,54 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import unittest
+import random
+
+from fuzzywuzzy import fuzz
+
+from fuzzyjoin.scoring import wratio
+
+
+class WRatioTestCase(unittest.TestCase):
+
+    _ALPHABET = 'abcdef gh'
+
+    def test_matches_wratio(self) -> None:
+        rng = random.Random(42)
+        for _ in range(500):
+            s1 = self._random_key(rng)
+            s2 = self._random_key(rng)
+            expected = fuzz.WRatio(s1, s2, full_process=False)
+            for score_cutoff in (0, 50, 60, 85, 90, 91, 95, 96, 100):
+                score = wratio(s1, s2, score_cutoff)
+                if expected >= score_cutoff:
+                    self.assertEqual(score, expected)
+                else:
+                    self.assertLess(score, score_cutoff)
+
+    def test_length_pruning(self) -> None:
+        self.assertEqual(wratio('yankee', 'yankee foxtrot hotel golf', 91), 0)
+        self.assertEqual(wratio('yankee', 'yankee foxtrot hotel golf', 0),
+                         fuzz.WRatio('yankee', 'yankee foxtrot hotel golf', full_process=False))
+        self.assertEqual(wratio('', 'yankee'), 0)
+
+    @classmethod
+    def _random_key(cls, rng: random.Random) -> str:
+        return ' '.join(''.join(rng.choice(cls._ALPHABET) for _ in range(rng.randint(1, 8))).split())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import unittest
+
+import numpy as np
+
+from fuzzyjoin.sorted_index import SortedIndex
+
+
+class SortedIndexTestCase(unittest.TestCase):
+
+    def test_nearest(self) -> None:
+        index = SortedIndex(np.array([11.0, 9.5, 17.0, 23.1]))
+        values = np.array([10.0, 20.0, 16.0, 30.0])
+        self.assertListEqual(list(index.nearest(values, np.abs(values) * 0.1)), [1, -1, 2, -1])
+
+    def test_beyond_choices(self) -> None:
+        index = SortedIndex(np.array([1.0, 2.0, 3.0]))
+        self.assertListEqual(list(index.nearest(np.array([3.1, 0.9, 5.0]), 0.5)), [2, 0, -1])
+
+    def test_tie_uses_first_choice(self) -> None:
+        index = SortedIndex(np.array([2.0, 0.0]))
+        self.assertListEqual(list(index.nearest(np.array([1.0]), 1.0)), [0])
+        index = SortedIndex(np.array([0.0, 2.0]))
+        self.assertListEqual(list(index.nearest(np.array([1.0]), 1.0)), [0])
+
+    def test_nulls(self) -> None:
+        index = SortedIndex(np.array([np.nan, 5.0]))
+        self.assertListEqual(list(index.nearest(np.array([np.nan, 5.0]), 1.0)), [-1, 1])
+        self.assertListEqual(list(SortedIndex(np.array([])).nearest(np.array([1.0]), 1.0)), [-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import unittest
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from os import path
+
+from fuzzyjoin.startup import read_git_commit
+
+# seconds that importing the primitive may take once d3m and the libraries it needs are imported
+_IMPORT_BUDGET = 0.5
+
+# libraries that are only imported once a join needs them
+_DEFERRED_MODULES = ('scipy.sparse', 'scipy.spatial', 'fuzzywuzzy.fuzz', 'fuzzywuzzy.utils', 'git')
+
+_IMPORT_SCRIPT = '''
+import json, sys, time
+import numpy, pandas
+from d3m import container, exceptions, utils
+from d3m.base import utils as base_utils
+from d3m.metadata import base as metadata_base, hyperparams
+from d3m.primitive_interfaces import base, transformer
+loaded = set(name for name, module in sys.modules.items() if type(module).__name__ == 'module')
+start = time.perf_counter()
+import fuzzyjoin.fuzzy_join
+seconds = time.perf_counter() - start
+print(json.dumps({'seconds': seconds, 'modules': [name for name, module in sys.modules.items()
+                                                  if name not in loaded and type(module).__name__ == 'module']}))
+'''
+
+
+class StartupTestCase(unittest.TestCase):
+
+    def test_read_git_commit(self) -> None:
+        commit = 'a4e935f8c523e877fbee6036e5ac4d60370c4e76'
+        with tempfile.TemporaryDirectory() as temp_dir:
+            package_dir = path.join(temp_dir, 'package')
+            self.assertIsNone(read_git_commit(package_dir))
+            git_dir = path.join(temp_dir, '.git')
+            os.makedirs(path.join(git_dir, 'refs', 'heads'))
+            os.makedirs(package_dir)
+
+            # a detached commit
+            self._write(path.join(git_dir, 'HEAD'), commit + '\n')
+            self.assertEqual(read_git_commit(package_dir), commit)
+
+            # a branch, packed and then as a file of its own
+            self._write(path.join(git_dir, 'HEAD'), 'ref: refs/heads/master\n')
+            self.assertIsNone(read_git_commit(package_dir))
+            self._write(path.join(git_dir, 'packed-refs'), '# pack-refs with: peeled fully-peeled sorted\n' +
+                        commit + ' refs/heads/master\n')
+            self.assertEqual(read_git_commit(package_dir), commit)
+            self._write(path.join(git_dir, 'refs', 'heads', 'master'), commit[::-1] + '\n')
+            self.assertEqual(read_git_commit(package_dir), commit[::-1])
+
+            # a submodule or worktree inside the repository, whose .git is a file, isn't read
+            self._write(path.join(package_dir, '.git'), 'gitdir: ../.git/modules/package\n')
+            self.assertIsNone(read_git_commit(package_dir))
+
+    @unittest.skipIf(importlib.util.find_spec('d3m') is None, 'd3m is not installed')
+    def test_import_budget(self) -> None:
+        # measured in a fresh interpreter, so nothing the primitive imports is already loaded
+        output = subprocess.run([sys.executable, '-c', _IMPORT_SCRIPT], check=True, stdout=subprocess.PIPE,
+                                cwd=path.dirname(path.dirname(path.dirname(path.abspath(__file__))))).stdout
+        measured = json.loads(output.decode('utf-8').strip().splitlines()[-1])
+        self.assertLess(measured['seconds'], _IMPORT_BUDGET)
+        self.assertListEqual([name for name in _DEFERRED_MODULES if name in measured['modules']], [])
+
+    def _write(self, file_path: str, contents: str) -> None:
+        with open(file_path, 'w') as out_file:
+            out_file.write(contents)
+
+
+if __name__ == '__main__':
+    unittest.main()
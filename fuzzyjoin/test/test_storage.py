@@ -0,0 +1,74 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import unittest
+import tempfile
+from os import path
+
+import numpy as np
+
+from fuzzyjoin.storage import load_arrays, save_arrays
+
+
+class StorageTestCase(unittest.TestCase):
+
+    def test_round_trip(self) -> None:
+        keys = np.empty(2, dtype=object)
+        keys[:] = [('yankee', 1), ('hotel', 2)]
+        arrays = {
+            'codes': np.array([0, 1, 1], dtype=np.int64),
+            'strings': np.array(['yankee', 'hotel'], dtype=object),
+            'keys': keys,
+        }
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            save_arrays(temp_dir, arrays, {'length': 3})
+            loaded, attributes = load_arrays(temp_dir)
+
+        # strings are mapped as fixed width strings, and only other python objects are pickled
+        self.assertDictEqual(attributes, {'length': 3})
+        self.assertIsInstance(loaded['codes'], np.memmap)
+        self.assertIsInstance(loaded['strings'], np.memmap)
+        self.assertListEqual(list(loaded['strings']), ['yankee', 'hotel'])
+        self.assertNotIsInstance(loaded['keys'], np.memmap)
+        self.assertListEqual(list(loaded['keys']), [('yankee', 1), ('hotel', 2)])
+
+    def test_padded_strings(self) -> None:
+        strings = np.array(['yankee', 'h\xf4tel', '', 'foxtrot ' * 100], dtype=object)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            save_arrays(temp_dir, {'strings': strings}, {})
+            loaded, attributes = load_arrays(temp_dir)
+            saved_size = path.getsize(path.join(temp_dir, 'strings.npy'))
+
+        # strings that would mostly be padding at a fixed width are saved as UTF-8, and read back into memory
+        self.assertDictEqual(attributes, {})
+        self.assertLess(saved_size, strings.astype(str).nbytes / 2)
+        self.assertNotIsInstance(loaded['strings'], np.memmap)
+        self.assertListEqual(list(loaded['strings']), list(strings))
+
+    def test_unlisted_objects(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            save_arrays(temp_dir, {}, {})
+            np.save(path.join(temp_dir, 'keys.npy'), np.array([('yankee', 1)], dtype=object), allow_pickle=True)
+
+            # arrays of python objects that save_arrays didn't list aren't unpickled
+            with self.assertRaises(ValueError):
+                load_arrays(temp_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
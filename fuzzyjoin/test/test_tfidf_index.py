@@ -0,0 +1,85 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+
+import unittest
+import tempfile
+from os import path
+
+import numpy as np
+
+from fuzzyjoin.tfidf_index import TfidfIndex
+
+
+class TfidfIndexTestCase(unittest.TestCase):
+
+    _CHOICES = np.array(['yankee', 'hotel', 'foxtrot', 'golf'], dtype=object)
+
+    def test_best_matches(self) -> None:
+        index = TfidfIndex(self._CHOICES, 0.5)
+        positions, candidates = index.best_matches(np.array(['yankeee', 'hotel', 'foxtrot aa', 'zulu'],
+                                                            dtype=object), 10)
+        self.assertListEqual(list(positions), [0, 1, 2, -1])
+        self.assertListEqual(list(candidates), [1, 1, 1, 0])
+
+    def test_min_similarity(self) -> None:
+        # identical keys always reach a min similarity of 1.0, and anything else falls short of it
+        index = TfidfIndex(self._CHOICES, 1.0)
+        positions, _ = index.best_matches(np.array(['golf', 'golfs', 'hotel'], dtype=object), 10)
+        self.assertListEqual(list(positions), [3, -1, 1])
+
+    def test_first_best_match(self) -> None:
+        index = TfidfIndex(np.array(['ab', 'ab', 'cd'], dtype=object), 0.1)
+        positions, candidates = index.best_matches(np.array(['ab'], dtype=object), 10)
+        self.assertListEqual(list(positions), [0])
+        self.assertListEqual(list(candidates), [2])
+
+    def test_block_size(self) -> None:
+        index = TfidfIndex(self._CHOICES, 0.3)
+        queries = np.array(['yank', 'otel', 'fox', 'golfer', 'yankee hotel', '', 'hotel'], dtype=object)
+        expected = index.best_matches(queries, len(queries))
+        for block_size in (1, 2, 3):
+            positions, candidates = index.best_matches(queries, block_size)
+            self.assertListEqual(list(positions), list(expected[0]))
+            self.assertListEqual(list(candidates), list(expected[1]))
+
+    def test_subset(self) -> None:
+        # the subset keeps the weights of the full index, so matches its similarities to the choices it keeps
+        queries = np.array(['yankeee', 'otel', 'golfs', 'zulu'], dtype=object)
+        for index in (TfidfIndex(self._CHOICES, 0.3), TfidfIndex(self._CHOICES, 0.3).subset(np.arange(4))):
+            subset = index.subset(np.array([3, 1]))
+            self.assertListEqual(list(subset.choices), ['golf', 'hotel'])
+            self.assertListEqual(list(subset.best_matches(queries, 2)[0]), [-1, 1, 0, -1])
+
+    def test_no_choices(self) -> None:
+        index = TfidfIndex(np.array([], dtype=object), 0.5)
+        positions, _ = index.best_matches(np.array(['golf'], dtype=object), 10)
+        self.assertListEqual(list(positions), [-1])
+
+    def test_save_load(self) -> None:
+        index = TfidfIndex(self._CHOICES, 0.5)
+        queries = np.array(['yankeee', 'otel', 'golfs', 'zulu'], dtype=object)
+        with tempfile.TemporaryDirectory() as index_dir:
+            index_path = path.join(index_dir, 'index')
+            index.save(index_path)
+            loaded = TfidfIndex.load(index_path)
+            self.assertEqual(loaded.min_similarity, 0.5)
+            self.assertListEqual(list(loaded.choices), list(self._CHOICES))
+            self.assertListEqual(list(loaded.best_matches(queries, 2)[0]), list(index.best_matches(queries, 2)[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+"""
+   Copyright © 2018 Uncharted Software Inc.
+
+   Licensed under the Apache License, Version 2.0 (the "License");
+   you may not use this file except in compliance with the License.
+   You may obtain a copy of the License at
+
+       http://www.apache.org/licenses/LICENSE-2.0
+
+   Unless required by applicable law or agreed to in writing, software
+   distributed under the License is distributed on an "AS IS" BASIS,
+   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+   See the License for the specific language governing permissions and
+   limitations under the License.
+"""
+
+import collections
+import math
+import typing
+
+import numpy as np
+
+from fuzzyjoin.storage import load_arrays, save_arrays
+
+if typing.TYPE_CHECKING:
+    from scipy import sparse  # type: ignore
+
+__all__ = ('TfidfIndex',)
+
+# Guards the similarity threshold against round-off, so identical vectors always reach a threshold of 1.0.
+_EPSILON = 1e-9
+
+
+class TfidfIndex:
+    """
+    TF-IDF weighted character n-gram vectors over a set of normalized string choices, with inverse document
+    frequencies taken from the choices.  The best match for each of a batch of queries is the choice with the
+    highest cosine similarity, found by multiplying blocks of query vectors against the sparse choice matrix, so
+    memory use is bounded by the block size rather than by the number of query and choice pairs.
+    """
+
+    def __init__(self,
+                 choices: typing.Sequence[str],
+                 min_similarity: float,
+                 n: int = 3) -> None:
+        # scipy is slow to import, so it's only imported once an index is built or loaded
+        from scipy import sparse  # type: ignore
+
+        self.choices = choices
+        self.min_similarity = min_similarity
+        self._n = n
+
+        grams: typing.Dict[str, int] = {}
+        indptr = [0]
+        indices: typing.List[int] = []
+        counts: typing.List[int] = []
+        for choice in choices:
+            for gram, count in _ngrams(choice, n).items():
+                indices.append(grams.setdefault(gram, len(grams)))
+                counts.append(count)
+            indptr.append(len(indices))
+        self._grams = grams
+
+        # smoothed idf, as if a document containing every gram had been seen - grams that no choice contains get
+        # the largest weight
+        gram_ids = np.array(indices, dtype=np.int64)
+        document_frequency = np.bincount(gram_ids, minlength=len(grams))
+        self._idf = np.log((1.0 + len(choices)) / (1.0 + document_frequency)) + 1.0
+        self._unseen_idf = math.log(1.0 + len(choices)) + 1.0
+
+        # choice vectors are stored transposed, so a block of query rows can be multiplied against them directly
+        indptr_array = np.array(indptr, dtype=np.int64)
+        data = _normalize_rows(np.array(counts, dtype=np.float64) * self._idf[gram_ids], indptr_array)
+        matrix = sparse.csr_matrix((data, gram_ids, indptr_array), shape=(len(choices), len(grams)))
+        self._matrix_t = matrix.T.tocsr()
+        # the untransposed choice vectors, only kept once a subset needs them
+        self._matrix: typing.Optional['sparse.csr_matrix'] = None
+
+    def best_matches(self,
+                     queries: typing.Sequence[str],
+                     block_size: int) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the position in the choices of the most similar choice to each normalized query, or -1 where no
+        choice reaches the minimum similarity, along with the number of choices that share an n-gram with each
+        query.  When two choices are equally similar, the one that appears first in the choices is used.  Queries
+        are compared against the choices block_size at a time.
+        """
+        positions = np.full(len(queries), -1, dtype=np.int64)
+        candidates = np.zeros(len(queries), dtype=np.int64)
+        if len(self.choices) == 0:
+            return positions, candidates
+
+        for start in range(0, len(queries), block_size):
+            block = slice(start, start + block_size)
+            similarity = self._vectorize(queries[block]).dot(self._matrix_t).tocsr()
+            candidates[block] = np.diff(similarity.indptr)
+
+            # drop pairs below the threshold, then take the most similar remaining choice in each row
+            similarity.data[similarity.data < self.min_similarity - _EPSILON] = 0.0
+            similarity.eliminate_zeros()
+            similarity.sort_indices()
+            best = np.asarray(similarity.argmax(axis=1)).ravel()
+            positions[block] = np.where(np.diff(similarity.indptr) > 0, best, -1)
+
+        return positions, candidates
+
+    def subset(self, positions: np.ndarray) -> 'TfidfIndex':
+        """
+        Returns an index over the choices at the given positions, in that order.  The n-grams keep the weights
+        taken from all of the choices, so similarities match those of the full index.  The subset's vectors are
+        taken as rows of the choice matrix, so only the vectors of its own choices are read.
+        """
+        if self._matrix is None:
+            # transposed back once, on the first subset
+            self._matrix = self._matrix_t.T.tocsr()
+
+        index = TfidfIndex.__new__(TfidfIndex)
+        index.choices = np.asarray(self.choices)[positions]
+        index.min_similarity = self.min_similarity
+        index._n = self._n
+        index._grams = self._grams
+        index._idf = self._idf
+        index._unseen_idf = self._unseen_idf
+        index._matrix = self._matrix[positions]
+        index._matrix_t = index._matrix.T.tocsr()
+        return index
+
+    def save(self, path: str) -> None:
+        """
+        Saves the index to a directory.
+        """
+        arrays = {
+            'choices': np.asarray(self.choices),
+            'grams': np.array(list(self._grams), dtype=str),
+            'idf': self._idf,
+            'indptr': self._matrix_t.indptr,
+            'indices': self._matrix_t.indices,
+            'data': self._matrix_t.data,
+        }
+        save_arrays(path, arrays, {'min_similarity': self.min_similarity, 'n': self._n,
+                                   'unseen_idf': self._unseen_idf})
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'TfidfIndex':
+        """
+        Loads an index saved to a directory, memory mapping its arrays if requested.
+        """
+        from scipy import sparse  # type: ignore
+
+        arrays, attributes = load_arrays(path, mmap)
+
+        index = cls.__new__(cls)
+        index.choices = arrays['choices']
+        index.min_similarity = attributes['min_similarity']
+        index._n = attributes['n']
+        index._grams = {gram: gram_id for gram_id, gram in enumerate(arrays['grams'])}
+        index._idf = arrays['idf']
+        index._unseen_idf = attributes['unseen_idf']
+        index._matrix_t = sparse.csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']),
+                                            shape=(len(index._grams), len(index.choices)))
+        index._matrix = None
+        return index
+
+    def _vectorize(self, queries: typing.Sequence[str]) -> 'sparse.csr_matrix':
+        from scipy import sparse  # type: ignore
+
+        # grams missing from the choices can't contribute to a similarity, but still count towards a query's norm
+        indptr = [0]
+        indices: typing.List[int] = []
+        weights: typing.List[float] = []
+        unseen_norms = np.zeros(len(queries))
+        for row, query in enumerate(queries):
+            for gram, count in _ngrams(query, self._n).items():
+                gram_id = self._grams.get(gram)
+                if gram_id is None:
+                    unseen_norms[row] += (count * self._unseen_idf) ** 2
+                else:
+                    indices.append(gram_id)
+                    weights.append(count * self._idf[gram_id])
+            indptr.append(len(indices))
+
+        indptr_array = np.array(indptr, dtype=np.int64)
+        data = _normalize_rows(np.array(weights, dtype=np.float64), indptr_array, unseen_norms)
+        return sparse.csr_matrix((data, np.array(indices, dtype=np.int64), indptr_array),
+                                 shape=(len(queries), len(self._grams)))
+
+
+def _ngrams(value: str, n: int) -> typing.Counter[str]:
+    # padded so that the start and end of a string form their own grams, and short strings still have one
+    padded = ' ' + value + ' '
+    return collections.Counter(padded[i:i + n] for i in range(len(padded) - n + 1)) if value else collections.Counter()
+
+
+def _normalize_rows(data: np.ndarray,
+                    indptr: np.ndarray,
+                    extra_squared_norms: typing.Optional[np.ndarray] = None) -> np.ndarray:
+    # scales the values of each row of a compressed sparse row matrix to unit length
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    squared_norms = np.bincount(rows, weights=data ** 2, minlength=len(indptr) - 1)
+    if extra_squared_norms is not None:
+        squared_norms = squared_norms + extra_squared_norms
+    norms = np.sqrt(squared_norms)
+    return data / np.where(norms > 0, norms, 1.0)[rows]
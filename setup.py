@@ -8,6 +8,7 @@ setup(
     keywords=['d3m_primitive'],
     install_requires=[
         'pandas >= 0.23.4',
+        'scipy>=1.2.1',
         'frozendict>=1.2',
         'fuzzywuzzy>=0.17.0',
         'python-Levenshtein>=0.12.0',